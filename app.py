@@ -13,19 +13,34 @@ Authentication:
 Deployment:
 - Run: databricks apps deploy dao-ai-builder --source-code-path .
 """
+import io
 import os
+import html
+import re
 import sys
 import json
+import time
+import uuid
+import yaml
+import tempfile
+import traceback
+import itertools
+import hashlib
 import secrets
 import logging
+import statistics
 import threading
+import queue
 import urllib.parse
+from collections import OrderedDict, deque
 from datetime import datetime
 from pathlib import Path
 from functools import lru_cache
+from operator import itemgetter
 
 import requests as http_requests
-from flask import Flask, send_from_directory, jsonify, request, Response, redirect, session, url_for
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, send_from_directory, jsonify, request, Response, redirect, session, url_for, g, has_request_context
 
 # Configure logging to write to stderr (captured by Databricks Apps)
 logging.basicConfig(
@@ -45,27 +60,133 @@ app.logger.handlers = []
 app.logger.addHandler(logging.StreamHandler(sys.stderr))
 app.logger.setLevel(logging.DEBUG)
 
-def log(level: str, msg: str):
-    """Write log to stderr and flush immediately for Databricks logs"""
-    print(f"[{level.upper()}] {msg}", file=sys.stderr, flush=True)
-    if level == 'debug':
-        logger.debug(msg)
-    elif level == 'info':
-        logger.info(msg)
-    elif level == 'warning':
-        logger.warning(msg)
-    elif level == 'error':
-        logger.error(msg)
+_LOG_LEVELS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+}
+
+
+def log(level: str, msg: str, exc_info: bool = False):
+    """Log to stderr via the handler configured above (captured by Databricks Apps).
+
+    Disabled levels (debug, by default) return without formatting or writing
+    anything. Pass exc_info=True inside an except block to attach the
+    traceback instead of pre-formatting it with traceback.format_exc().
+    """
+    lvl = _LOG_LEVELS.get(level, logging.INFO)
+    if logger.isEnabledFor(lvl):
+        logger.log(lvl, msg, exc_info=exc_info)
 
 # Log startup
 log('info', "DAO AI Builder starting up...")
 log('info', f"Python version: {sys.version}")
 log('info', f"Working directory: {os.getcwd()}")
 
+# Use orjson for JSON serialization when available. orjson encodes straight
+# to bytes in C and is several times faster than the stdlib encoder on the
+# dict-heavy payloads this app returns (verify, debug, resource listings).
+# It is declared in pyproject.toml, so the stdlib fallback below only kicks
+# in on a packaging regression - which the warning makes visible.
+try:
+    import orjson
+    from flask.json.provider import JSONProvider
+
+    class OrjsonProvider(JSONProvider):
+        """flask.json provider backed by orjson."""
+
+        def dumps(self, obj, **kwargs) -> str:
+            option = orjson.OPT_NON_STR_KEYS
+            if kwargs.get('sort_keys'):
+                option |= orjson.OPT_SORT_KEYS
+            return orjson.dumps(obj, default=str, option=option).decode('utf-8')
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+    log('info', "Using orjson for JSON serialization")
+except ImportError:
+    orjson = None
+    log('warning', "orjson not installed - falling back to stdlib json; "
+                   "JSON fast paths are disabled")
+
+
+def fast_jsonify(payload, status: int = 200):
+    """Build a JSON response directly from orjson bytes when available.
+
+    For high-frequency polling endpoints this skips jsonify's provider
+    round-trip (dumps to str, re-encode to bytes); falls back to the stdlib
+    encoder when orjson is not installed.
+    """
+    if orjson is not None:
+        body = orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        body = json.dumps(payload, default=str)
+    return app.response_class(body, status=status, mimetype='application/json')
+
+
+def _sse_event(payload: dict) -> bytes:
+    """Frame a payload as a Server-Sent Events data line.
+
+    Returns bytes so streaming generators skip the per-chunk str->bytes
+    re-encode in the WSGI layer; serialized with orjson when available.
+    """
+    if orjson is not None:
+        return b'data: ' + orjson.dumps(payload, default=str) + b'\n\n'
+    return f"data: {json.dumps(payload, default=str)}\n\n".encode()
+
+
+def _canonical_key(obj) -> bytes:
+    """Serialize an object to canonical JSON bytes for use as a cache key.
+
+    Sorted keys make semantically equal dicts produce identical bytes
+    regardless of insertion order; orjson keeps the canonicalization close to
+    the cost of the hash itself.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, default=str).encode()
+
+
+def _get_request_json():
+    """Parse the JSON request body, with orjson when available.
+
+    Reads the body uncached (cache=False) so multi-KB deploy configs aren't
+    buffered a second time by Flask; falls back to request.get_json() when
+    orjson is not installed. Malformed or empty bodies are routed through
+    Flask's own failure handler so they abort with the same 400 BadRequest
+    request.get_json() raises, not a 500 from a raw decode error.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(request.get_data(cache=False))
+        except ValueError as e:
+            return request.on_json_loading_failed(e)
+    return request.get_json()
+
+# Pooled HTTP session for outbound Databricks calls (verify probes, OAuth
+# token exchange, the API proxy, serving-endpoint streaming). Reusing one
+# session keeps TCP/TLS connections alive across requests instead of paying
+# the handshake cost on every call.
+_http_session = http_requests.Session()
+_http_session.mount('https://', http_requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=100))
+
+# Small worker pool so the verify endpoint can issue its two outbound probes
+# (warehouses + SCIM) concurrently instead of serially.
+_VERIFY_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='verify')
+
 # Secret key for session management
-# Use a stable key from environment or generate a stable one based on hostname
-# This ensures sessions persist across app restarts
-default_secret = os.environ.get('DATABRICKS_HOST', 'dao-ai-builder') + '-session-key'
+# Use a stable key from environment or derive a stable one from the host +
+# app name. Hash-derived so the fallback is not a guessable literal string,
+# while still persisting sessions across app restarts. FLASK_SECRET_KEY
+# should always be set in real deployments.
+_secret_seed = (
+    os.environ.get('DATABRICKS_HOST', '')
+    + os.environ.get('DATABRICKS_APP_NAME', 'dao-ai-builder')
+)
+default_secret = hashlib.blake2b(_secret_seed.encode(), digest_size=32).hexdigest()
 app.secret_key = os.environ.get('FLASK_SECRET_KEY', default_secret)
 
 # Configure session cookies for proper handling in incognito mode and HTTPS
@@ -82,11 +203,43 @@ app.config.update(
 )
 log('info', f"Session configured: SameSite=Lax, Secure={is_https}")
 
+# Optional server-side sessions: when SESSION_REDIS_URL (or REDIS_URL) points
+# at a Redis instance and Flask-Session is installed, the cookie carries only
+# a short session id instead of the full OAuth token payload, cutting both
+# request size and per-request HMAC work. Without the package or the URL the
+# default signed-cookie sessions are kept unchanged.
+_session_redis_url = os.environ.get('SESSION_REDIS_URL') or os.environ.get('REDIS_URL')
+if _session_redis_url:
+    try:
+        import redis
+        from flask_session import Session
+
+        app.config.update(
+            SESSION_TYPE='redis',
+            SESSION_REDIS=redis.from_url(_session_redis_url),
+            SESSION_PERMANENT=True,
+            SESSION_USE_SIGNER=True,
+        )
+        Session(app)
+        log('info', "Server-side sessions enabled (Redis)")
+    except ImportError:
+        log('warning', "SESSION_REDIS_URL is set but Flask-Session/redis are not installed; keeping cookie sessions")
+    except Exception as e:
+        log('warning', f"Could not enable Redis sessions, keeping cookie sessions: {e}")
+
 # Static folder path - defaults to 'static' in the same directory as this file
 STATIC_FOLDER = os.environ.get('STATIC_FOLDER', 'static')
 if not os.path.isabs(STATIC_FOLDER):
     STATIC_FOLDER = os.path.join(os.path.dirname(__file__), STATIC_FOLDER)
 
+# Let the WSGI server hand static responses to a fronting server via
+# X-Sendfile when one is configured (no-op on Databricks Apps).
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE', 'false').lower() == 'true'
+
+# Vite emits content-hashed asset filenames (e.g. index-1C3eemwY.js), so
+# bundles can be cached for a year; everything else stays conditional only.
+_ASSET_CACHE_MAX_AGE = 31536000
+
 # OAuth2 configuration
 # These are populated from environment or app configuration
 OAUTH_CLIENT_ID = os.environ.get('OAUTH_CLIENT_ID')
@@ -108,6 +261,14 @@ OAUTH_SCOPES = [
     'offline_access',  # For refresh tokens
 ]
 
+# Precomputed once: the scope string and the static authorize-request params
+# never change after import
+_OAUTH_SCOPE_STR = ' '.join(OAUTH_SCOPES)
+_STATIC_AUTH_PARAMS = {
+    'response_type': 'code',
+    'scope': _OAUTH_SCOPE_STR,
+}
+
 
 # Cache the SDK config to avoid repeated lookups
 @lru_cache(maxsize=1)
@@ -128,8 +289,13 @@ def get_sdk_config():
         return None
 
 
+@lru_cache(maxsize=128)
 def normalize_host(host: str) -> str:
-    """Ensure host has https:// scheme."""
+    """Ensure host has https:// scheme.
+
+    Memoized: this runs on every proxy request and the workspace host is one
+    of a handful of fixed values, so the hit rate is effectively 100%.
+    """
     if not host:
         return host
     host = host.strip().rstrip('/')
@@ -157,12 +323,30 @@ def is_databricks_app_url(host: str) -> bool:
     return 'databricksapps.com' in host.lower()
 
 
+@lru_cache(maxsize=1)
+def _sdk_host_token() -> tuple[str | None, str | None]:
+    """Resolve (host, token) from the SDK Config once.
+
+    Config() is already cached, but its property access can still walk
+    credential provider chains (profile file reads, CLI shellouts) on every
+    call, so the resolved values are memoized too. These are process-level
+    fallbacks and do not change while the app runs.
+    """
+    sdk_config = get_sdk_config()
+    if sdk_config is None:
+        return None, None
+    host = normalize_host(sdk_config.host) if sdk_config.host else None
+    try:
+        token = sdk_config.token or None
+    except Exception:
+        token = None
+    return host, token
+
+
 def get_databricks_host_from_sdk() -> str | None:
     """Get host from Databricks SDK Config."""
-    sdk_config = get_sdk_config()
-    if sdk_config and sdk_config.host:
-        return normalize_host(sdk_config.host)
-    return None
+    host, _ = _sdk_host_token()
+    return host
 
 
 def get_databricks_host() -> str | None:
@@ -173,16 +357,8 @@ def get_databricks_host() -> str | None:
 
 def get_databricks_token_from_sdk() -> str | None:
     """Get token from Databricks SDK Config."""
-    sdk_config = get_sdk_config()
-    if sdk_config:
-        try:
-            # The SDK Config can provide tokens from various auth methods
-            # This will return None if no auth is configured
-            if sdk_config.token:
-                return sdk_config.token
-        except Exception:
-            pass
-    return None
+    _, token = _sdk_host_token()
+    return token
 
 
 def get_databricks_token_with_source() -> tuple[str | None, str | None]:
@@ -209,6 +385,23 @@ def get_databricks_token_with_source() -> tuple[str | None, str | None]:
             - 'env': DATABRICKS_TOKEN environment variable
             - None: No token found
     """
+    # Memoized per request via flask.g: handlers resolve the token several
+    # times (proxying, logging, secret resolution) and the answer cannot
+    # change within a single request.
+    if has_request_context():
+        cached = getattr(g, '_databricks_token_with_source', None)
+        if cached is not None:
+            return cached
+
+    result = _resolve_databricks_token_with_source()
+
+    if has_request_context():
+        g._databricks_token_with_source = result
+    return result
+
+
+def _resolve_databricks_token_with_source() -> tuple[str | None, str | None]:
+    """Uncached token resolution; see get_databricks_token_with_source."""
     # Try session token first (OAuth flow)
     if 'access_token' in session:
         return session['access_token'], 'oauth'
@@ -270,6 +463,21 @@ def get_databricks_host_with_source() -> tuple[str | None, str | None]:
             - 'env': DATABRICKS_HOST environment variable
             - None: No host found
     """
+    # Memoized per request via flask.g, same rationale as the token resolver.
+    if has_request_context():
+        cached = getattr(g, '_databricks_host_with_source', None)
+        if cached is not None:
+            return cached
+
+    result = _resolve_databricks_host_with_source()
+
+    if has_request_context():
+        g._databricks_host_with_source = result
+    return result
+
+
+def _resolve_databricks_host_with_source() -> tuple[str | None, str | None]:
+    """Uncached host resolution; see get_databricks_host_with_source."""
     # Check session first (OAuth flow)
     if 'databricks_host' in session:
         return session['databricks_host'], 'oauth'
@@ -303,6 +511,17 @@ def get_databricks_host_with_source() -> tuple[str | None, str | None]:
 # OAuth2 Endpoints
 # =============================================================================
 
+@lru_cache(maxsize=64)
+def _cached_callback_url(scheme: str, host: str) -> str:
+    """Build the external OAuth callback URL once per (scheme, host).
+
+    url_for(..., _external=True) walks the URL map and rebuilds the host part
+    on every call; the callback route is static, so memoize per origin.
+    """
+    with app.test_request_context(base_url=f"{scheme}://{host}"):
+        return url_for('oauth_callback', _external=True)
+
+
 @app.route('/api/auth/login')
 def oauth_login():
     """
@@ -346,8 +565,10 @@ def oauth_login():
     # Generate state for CSRF protection
     state = secrets.token_urlsafe(32)
     
-    # Make session permanent for better cookie persistence
-    session.permanent = True
+    # Make session permanent for better cookie persistence. Gated so a retry
+    # doesn't mark the session modified (and force a re-sign) needlessly.
+    if not session.permanent:
+        session.permanent = True
     session['oauth_state'] = state
     session['oauth_host'] = host
     
@@ -358,14 +579,13 @@ def oauth_login():
     auth_endpoint = f"{host}/oidc/v1/authorize"
     
     # Get the callback URL
-    callback_url = url_for('oauth_callback', _external=True)
+    callback_url = _cached_callback_url(request.scheme, request.host)
     
     # Build the authorization URL
     params = {
+        **_STATIC_AUTH_PARAMS,
         'client_id': client_id,
-        'response_type': 'code',
         'redirect_uri': callback_url,
-        'scope': ' '.join(OAUTH_SCOPES),
         'state': state,
     }
     
@@ -379,22 +599,20 @@ def oauth_login():
     })
 
 
-@app.route('/api/auth/callback')
-def oauth_callback():
-    """
-    Handle OAuth2 callback with authorization code.
-    Exchange code for access token.
-    """
-    log('info', f"OAuth callback received. Session keys: {list(session.keys())}")
-    
-    # Verify state
-    state = request.args.get('state')
-    stored_state = session.get('oauth_state')
-    
-    if not stored_state:
-        log('error', "OAuth state not found in session - session may have expired or cookies not set")
-        # Return a user-friendly HTML page instead of JSON for better UX
-        return '''
+# Double-submit guard for the OAuth code exchange: browsers occasionally
+# re-fire the callback (back button, duplicated tab), and authorization codes
+# are single-use upstream. Remember successful exchanges briefly so a retry
+# reuses the first token response instead of failing the login.
+_TOKEN_EXCHANGE_TTL_SECONDS = 30
+_TOKEN_EXCHANGE_CACHE_MAX = 128
+_token_exchange_cache: OrderedDict = OrderedDict()  # (code, client_id) -> (expires_at, response)
+_token_exchange_cache_lock = threading.Lock()
+
+_TOKEN_EXCHANGE_HEADERS = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+
+# Static OAuth error pages, built once instead of per failed callback
+_SESSION_EXPIRED_HTML = '''
         <!DOCTYPE html>
         <html>
         <head><title>Session Error</title></head>
@@ -408,11 +626,9 @@ def oauth_callback():
             </p>
         </body>
         </html>
-        ''', 400
-    
-    if state != stored_state:
-        log('error', f"OAuth state mismatch. Expected: {stored_state[:10]}..., Got: {state[:10] if state else 'None'}...")
-        return '''
+        '''
+
+_STATE_MISMATCH_HTML = '''
         <!DOCTYPE html>
         <html>
         <head><title>Security Error</title></head>
@@ -422,14 +638,22 @@ def oauth_callback():
             <p><a href="/" style="color: #0066cc;">Please try logging in again</a></p>
         </body>
         </html>
-        ''', 400
-    
-    # Check for errors from OAuth provider
-    error = request.args.get('error')
-    if error:
-        error_description = request.args.get('error_description', 'Unknown error')
-        log('error', f"OAuth error from provider: {error} - {error_description}")
-        return f'''
+        '''
+
+_OAUTH_HOST_MISSING_HTML = '''
+        <!DOCTYPE html>
+        <html>
+        <head><title>Session Error</title></head>
+        <body style="font-family: sans-serif; padding: 40px; text-align: center;">
+            <h1>Session Expired</h1>
+            <p>The OAuth session has expired. Please try logging in again.</p>
+            <p><a href="/" style="color: #0066cc;">Return to Application</a></p>
+        </body>
+        </html>
+        '''
+
+# Provider errors carry dynamic text; format (with escaping) into this template
+_OAUTH_ERROR_TMPL = '''
         <!DOCTYPE html>
         <html>
         <head><title>Authentication Error</title></head>
@@ -440,7 +664,39 @@ def oauth_callback():
             <p><a href="/" style="color: #0066cc;">Return to Application</a></p>
         </body>
         </html>
-        ''', 400
+        '''
+
+
+@app.route('/api/auth/callback')
+def oauth_callback():
+    """
+    Handle OAuth2 callback with authorization code.
+    Exchange code for access token.
+    """
+    log('info', f"OAuth callback received. Session keys: {list(session.keys())}")
+    
+    # Verify state
+    state = request.args.get('state')
+    stored_state = session.get('oauth_state')
+    
+    if not stored_state:
+        log('error', "OAuth state not found in session - session may have expired or cookies not set")
+        # Return a user-friendly HTML page instead of JSON for better UX
+        return _SESSION_EXPIRED_HTML, 400
+    
+    if state != stored_state:
+        log('error', f"OAuth state mismatch. Expected: {stored_state[:10]}..., Got: {state[:10] if state else 'None'}...")
+        return _STATE_MISMATCH_HTML, 400
+    
+    # Check for errors from OAuth provider
+    error = request.args.get('error')
+    if error:
+        error_description = request.args.get('error_description', 'Unknown error')
+        log('error', f"OAuth error from provider: {error} - {error_description}")
+        return _OAUTH_ERROR_TMPL.format(
+            error=html.escape(error),
+            error_description=html.escape(error_description),
+        ), 400
     
     # Get authorization code
     code = request.args.get('code')
@@ -452,17 +708,7 @@ def oauth_callback():
     host = session.get('oauth_host')
     if not host:
         log('error', "OAuth host not found in session")
-        return '''
-        <!DOCTYPE html>
-        <html>
-        <head><title>Session Error</title></head>
-        <body style="font-family: sans-serif; padding: 40px; text-align: center;">
-            <h1>Session Expired</h1>
-            <p>The OAuth session has expired. Please try logging in again.</p>
-            <p><a href="/" style="color: #0066cc;">Return to Application</a></p>
-        </body>
-        </html>
-        ''', 400
+        return _OAUTH_HOST_MISSING_HTML, 400
     
     # Get OAuth credentials
     client_id = OAUTH_CLIENT_ID or os.environ.get('DATABRICKS_OAUTH_CLIENT_ID') or os.environ.get('DATABRICKS_APP_CLIENT_ID')
@@ -470,7 +716,7 @@ def oauth_callback():
     
     # Exchange code for token
     token_endpoint = f"{host}/oidc/v1/token"
-    callback_url = url_for('oauth_callback', _external=True)
+    callback_url = _cached_callback_url(request.scheme, request.host)
     
     token_data = {
         'grant_type': 'authorization_code',
@@ -482,38 +728,50 @@ def oauth_callback():
     if client_secret:
         token_data['client_secret'] = client_secret
     
+    # Reuse a just-completed exchange for the same code (double-submit)
+    exchange_key = (code, client_id)
+    with _token_exchange_cache_lock:
+        entry = _token_exchange_cache.get(exchange_key)
+    token_response = entry[1] if entry and entry[0] > time.time() else None
+
     try:
-        response = http_requests.post(
-            token_endpoint,
-            data=token_data,
-            headers={'Content-Type': 'application/x-www-form-urlencoded'},
-            timeout=30,
-        )
-        
-        if response.ok:
+        if token_response is None:
+            response = _http_session.post(
+                token_endpoint,
+                data=token_data,
+                headers=_TOKEN_EXCHANGE_HEADERS,
+                timeout=30,
+            )
+
+            if not response.ok:
+                error_data = response.json() if response.headers.get('Content-Type', '').startswith('application/json') else {}
+                return jsonify({
+                    'error': 'Token exchange failed',
+                    'message': error_data.get('error_description', response.text),
+                }), 400
+
             token_response = response.json()
-            
-            # Store tokens in session
-            session['access_token'] = token_response.get('access_token')
-            session['refresh_token'] = token_response.get('refresh_token')
-            session['token_expires_in'] = token_response.get('expires_in')
-            session['databricks_host'] = host
-            
-            # Clear OAuth state
-            session.pop('oauth_state', None)
-            session.pop('oauth_host', None)
-            
-            log('info', "OAuth token exchange successful")
-            
-            # Redirect back to the app
-            return redirect('/')
-        else:
-            error_data = response.json() if response.headers.get('Content-Type', '').startswith('application/json') else {}
-            return jsonify({
-                'error': 'Token exchange failed',
-                'message': error_data.get('error_description', response.text),
-            }), 400
-            
+            with _token_exchange_cache_lock:
+                _token_exchange_cache[exchange_key] = (
+                    time.time() + _TOKEN_EXCHANGE_TTL_SECONDS, token_response)
+                while len(_token_exchange_cache) > _TOKEN_EXCHANGE_CACHE_MAX:
+                    _token_exchange_cache.popitem(last=False)
+
+        # Store tokens in session
+        session['access_token'] = token_response.get('access_token')
+        session['refresh_token'] = token_response.get('refresh_token')
+        session['token_expires_in'] = token_response.get('expires_in')
+        session['databricks_host'] = host
+
+        # Clear OAuth state
+        session.pop('oauth_state', None)
+        session.pop('oauth_host', None)
+
+        log('info', "OAuth token exchange successful")
+
+        # Redirect back to the app
+        return redirect('/')
+
     except Exception as e:
         log('error', f"OAuth token exchange error: {e}")
         return jsonify({
@@ -554,14 +812,17 @@ def get_auth_context():
     This endpoint detects the authentication method and returns workspace info,
     including the source of both the host and token.
     """
-    # Check for Databricks App headers
-    email = request.headers.get('X-Forwarded-Email')
-    username = request.headers.get('X-Forwarded-Preferred-Username')
-    user_id = request.headers.get('X-Forwarded-User')
-    real_ip = request.headers.get('X-Real-Ip')
-    
+    # Check for Databricks App headers. Read straight from the WSGI environ:
+    # one dict hash per header instead of a case-insensitive EnvironHeaders
+    # scan for each of the five lookups.
+    env = request.environ
+    email = env.get('HTTP_X_FORWARDED_EMAIL')
+    username = env.get('HTTP_X_FORWARDED_PREFERRED_USERNAME')
+    user_id = env.get('HTTP_X_FORWARDED_USER')
+    real_ip = env.get('HTTP_X_REAL_IP')
+
     # Determine if we're in a Databricks App context
-    has_obo_token = bool(request.headers.get('X-Forwarded-Access-Token'))
+    has_obo_token = bool(env.get('HTTP_X_FORWARDED_ACCESS_TOKEN'))
     is_databricks_app = bool(email or username or user_id or has_obo_token)
     
     # Check OAuth status
@@ -753,28 +1014,31 @@ def proxy_databricks(path: str):
     if request.query_string:
         target_url += f"?{request.query_string.decode('utf-8')}"
     
-    # Prepare headers
-    headers = {
-        'Authorization': f'Bearer {token}',
-        'Content-Type': 'application/json',
-    }
-    
+    # Prepare headers. Only claim a body when there actually is one: some
+    # upstreams reject Content-Type on empty-body GET/DELETE requests. The
+    # client's own Content-Type is forwarded so non-JSON bodies (e.g.
+    # multipart uploads to Volumes) pass through untouched.
+    headers = {'Authorization': 'Bearer ' + token}
+    if request.content_length:
+        headers['Content-Type'] = request.headers.get('Content-Type', 'application/json')
+
     log('info', f"Proxying {request.method} to {target_url} (host from {host_source}, token from {token_source})")
     
     try:
-        resp = http_requests.request(
+        resp = _http_session.request(
             method=request.method,
             url=target_url,
             headers=headers,
-            json=request.get_json(silent=True) if request.is_json else None,
+            # Raw passthrough: no parse+reserialize of the body in the proxy
+            data=request.get_data(cache=False) if request.content_length else None,
             timeout=30,
+            stream=True,
         )
-        
-        # Log response details for debugging
-        resp_preview = resp.text[:200] if len(resp.text) > 200 else resp.text
-        log('info', f"Databricks response: {resp.status_code} - {resp_preview}")
-        
-        # Check for scope errors and enhance the message
+
+        log('info', f"Databricks response: {resp.status_code}")
+
+        # Check for scope errors and enhance the message (error bodies are
+        # small, so buffering them via .json() is fine)
         if resp.status_code in (401, 403):
             try:
                 error_data = resp.json()
@@ -797,9 +1061,12 @@ def proxy_databricks(path: str):
             except Exception:
                 pass  # Fall through to return original response
         
-        # For successful responses, add token source header for debugging
+        # Pipe the upstream body through without buffering it: the client
+        # starts receiving bytes as they arrive and large listings never sit
+        # fully resident in the worker. (If an error body was already read by
+        # the scope check above, iter_content replays the cached content.)
         response = Response(
-            resp.content,
+            resp.iter_content(chunk_size=65536),
             status=resp.status_code,
             content_type=resp.headers.get('Content-Type', 'application/json'),
         )
@@ -810,44 +1077,56 @@ def proxy_databricks(path: str):
         return jsonify({'error': f'Failed to connect to Databricks: {str(e)}'}), 502
 
 
+# Map API path fragments to the OAuth scopes they likely require. Compiled
+# into a single alternation so the 401/403 path pays one C-level regex search
+# instead of ~30 Python substring checks.
+_SCOPE_MAPPINGS = (
+    # SQL and warehouses
+    (('/sql/', '/warehouses'), ['sql']),
+    # Serving endpoints
+    (('/serving-endpoints', '/endpoints'), ['serving.serving-endpoints']),
+    # Vector search
+    (('/vector-search', '/indexes'), ['vectorsearch.vector-search-indexes', 'vectorsearch.vector-search-endpoints']),
+    # Genie
+    (('/genie', '/dashboards'), ['dashboards.genie']),
+    # Files and volumes
+    (('/files', '/volumes', '/dbfs'), ['files.files']),
+    # Unity Catalog
+    (('/catalog', '/schemas', '/tables', '/functions'), ['sql']),
+    # SCIM / Users
+    (('/scim', '/users', '/me'), ['iam.current-user:read']),
+    # Clusters
+    (('/clusters',), ['clusters.clusters']),
+    # Jobs
+    (('/jobs',), ['jobs.jobs']),
+    # MLflow
+    (('/mlflow', '/experiments', '/models', '/registered-models'), ['mlflow.experiments', 'mlflow.registered-models']),
+    # Workspace
+    (('/workspace',), ['workspace.workspace']),
+)
+
+_SCOPE_PATTERN = re.compile('|'.join(
+    f'(?P<g{i}>{"|".join(re.escape(p) for p in patterns)})'
+    for i, (patterns, _) in enumerate(_SCOPE_MAPPINGS)
+))
+_SCOPES_BY_GROUP = {f'g{i}': scopes for i, (_, scopes) in enumerate(_SCOPE_MAPPINGS)}
+_DEFAULT_REQUIRED_SCOPES = ['sql', 'serving.serving-endpoints', 'files.files']
+
+
+@lru_cache(maxsize=512)
 def _get_required_scopes_for_path(path: str) -> list[str]:
     """
     Determine which OAuth scopes are likely required for a given API path.
+
+    Memoized: the frontend hits a small set of API paths repeatedly, so
+    after warmup the regex search is skipped entirely. Callers treat the
+    returned list as read-only.
     """
-    path_lower = path.lower()
-    
-    # Map API paths to required scopes
-    scope_mappings = [
-        # SQL and warehouses
-        (('/sql/', '/warehouses'), ['sql']),
-        # Serving endpoints
-        (('/serving-endpoints', '/endpoints'), ['serving.serving-endpoints']),
-        # Vector search
-        (('/vector-search', '/indexes'), ['vectorsearch.vector-search-indexes', 'vectorsearch.vector-search-endpoints']),
-        # Genie
-        (('/genie', '/dashboards'), ['dashboards.genie']),
-        # Files and volumes
-        (('/files', '/volumes', '/dbfs'), ['files.files']),
-        # Unity Catalog
-        (('/catalog', '/schemas', '/tables', '/functions'), ['sql']),
-        # SCIM / Users
-        (('/scim', '/users', '/me'), ['iam.current-user:read']),
-        # Clusters
-        (('/clusters',), ['clusters.clusters']),
-        # Jobs
-        (('/jobs',), ['jobs.jobs']),
-        # MLflow
-        (('/mlflow', '/experiments', '/models', '/registered-models'), ['mlflow.experiments', 'mlflow.registered-models']),
-        # Workspace
-        (('/workspace',), ['workspace.workspace']),
-    ]
-    
-    for patterns, scopes in scope_mappings:
-        if any(pattern in path_lower for pattern in patterns):
-            return scopes
-    
+    match = _SCOPE_PATTERN.search(path.lower())
+    if match:
+        return _SCOPES_BY_GROUP[match.lastgroup]
     # Default - return common scopes
-    return ['sql', 'serving.serving-endpoints', 'files.files']
+    return _DEFAULT_REQUIRED_SCOPES
 
 
 # =============================================================================
@@ -860,6 +1139,24 @@ def health_check():
     return jsonify({'status': 'healthy'})
 
 
+@app.after_request
+def _set_api_cache_headers(response):
+    """Keep authenticated API responses out of shared caches.
+
+    API responses routinely embed per-user data (tokens, listings scoped to
+    the caller), and Flask only emits Vary: Cookie when the session is
+    touched. Default /api responses to private unless the handler already set
+    a policy; the anonymous health probe is explicitly edge-cacheable.
+    """
+    if request.path.startswith('/api/') and 'Cache-Control' not in response.headers:
+        if request.path == '/api/health':
+            response.headers['Cache-Control'] = 'public, max-age=60'
+        else:
+            response.headers['Cache-Control'] = 'private, no-store'
+            response.headers.add('Vary', 'Cookie')
+    return response
+
+
 # =============================================================================
 # Unity Catalog & Resource APIs (using user auth when available)
 # These APIs prefer the requesting user's credentials so that resource listings
@@ -868,6 +1165,67 @@ def health_check():
 # token is available (e.g. local development without OBO headers).
 # =============================================================================
 
+# WorkspaceClients keyed by (host, token) hash. Each client owns a keep-alive
+# requests.Session, so reusing it across requests skips the TCP/TLS handshake
+# on every SDK call; bounded so expired user tokens age out.
+_workspace_client_cache: OrderedDict = OrderedDict()
+_workspace_client_cache_lock = threading.Lock()
+_WORKSPACE_CLIENT_CACHE_MAX = 64
+
+
+def _cached_workspace_client(host: str, token: str):
+    """Return a WorkspaceClient for this host/token pair, reusing if seen."""
+    from databricks.sdk import WorkspaceClient
+
+    key = hashlib.blake2b(f'{host}|{token}'.encode(), digest_size=16).hexdigest()
+    with _workspace_client_cache_lock:
+        client = _workspace_client_cache.get(key)
+        if client is not None:
+            _workspace_client_cache.move_to_end(key)
+            return client
+
+    client = WorkspaceClient(host=host, token=token)
+
+    with _workspace_client_cache_lock:
+        _workspace_client_cache[key] = client
+        while len(_workspace_client_cache) > _WORKSPACE_CLIENT_CACHE_MAX:
+            _workspace_client_cache.popitem(last=False)
+    return client
+
+
+@lru_cache(maxsize=1)
+def _default_workspace_client():
+    """Build the default-auth (service principal) WorkspaceClient once."""
+    from databricks.sdk import WorkspaceClient
+    return WorkspaceClient()
+
+
+def _invalidate_workspace_client(client) -> None:
+    """Drop a cached WorkspaceClient whose credentials have expired.
+
+    The next get_workspace_client() call rebuilds it with fresh auth.
+    """
+    with _workspace_client_cache_lock:
+        for key, cached in list(_workspace_client_cache.items()):
+            if cached is client:
+                del _workspace_client_cache[key]
+                break
+    try:
+        if client is _default_workspace_client():
+            _default_workspace_client.cache_clear()
+    except Exception:
+        pass
+
+
+def _is_auth_error(error: Exception) -> bool:
+    """Best-effort check for a 401/expired-credential SDK error."""
+    status = getattr(error, 'status_code', None) or getattr(error, 'status', None)
+    if status == 401:
+        return True
+    name = type(error).__name__
+    return name in ('Unauthenticated', 'TokenRefreshError')
+
+
 def get_workspace_client():
     """
     Get a WorkspaceClient authenticated as the current user when possible.
@@ -880,10 +1238,9 @@ def get_workspace_client():
     5. DATABRICKS_TOKEN environment variable
 
     Falls back to default SDK auth (service principal) when no user token
-    or host is available.
+    or host is available. Clients are cached per host/token so their pooled
+    HTTP connections survive across requests.
     """
-    from databricks.sdk import WorkspaceClient
-
     try:
         token, source = get_databricks_token_with_source()
         host, _ = get_databricks_host_with_source()
@@ -893,36 +1250,83 @@ def get_workspace_client():
             if not host.startswith('http'):
                 host = f'https://{host}'
             log('debug', f"WorkspaceClient using {source} token for user auth")
-            return WorkspaceClient(host=host, token=token)
+            return _cached_workspace_client(host, token)
     except Exception as e:
         log('warning', f"Failed to resolve user credentials, falling back to default SDK auth: {e}")
 
     log('debug', "WorkspaceClient using default SDK auth (service principal)")
-    return WorkspaceClient()
+    return _default_workspace_client()
+
+
+# Current-user lookups that fall through to the SDK are cached across
+# requests by token digest: the answer for a given token cannot change, and
+# the w.current_user.me() RPC would otherwise run on every /api/uc/* hit for
+# PAT users (OBO requests are answered from headers and never get here).
+_USER_EMAIL_TTL_SECONDS = 300
+_USER_EMAIL_CACHE_MAX = 1024
+_user_email_cache: OrderedDict = OrderedDict()  # token digest -> (expires_at, email)
+_user_email_cache_lock = threading.Lock()
 
 
 def get_current_user_email() -> str | None:
     """
     Get the current user's email from OBO headers or by calling the API.
+
+    Memoized per request via flask.g, and across requests by token digest
+    for the SDK fallback, so the lookup is at most one RPC per token per
+    five minutes rather than one per handler invocation.
     """
+    if has_request_context():
+        cached = getattr(g, '_current_user_email', None)
+        if cached is not None:
+            return cached
+
+    email = _resolve_current_user_email()
+
+    if has_request_context() and email is not None:
+        g._current_user_email = email
+    return email
+
+
+def _resolve_current_user_email() -> str | None:
     # First try OBO headers
     forwarded_email = request.headers.get('X-Forwarded-Email')
     if forwarded_email:
         return forwarded_email
-    
+
     forwarded_username = request.headers.get('X-Forwarded-Preferred-Username')
     if forwarded_username:
         return forwarded_username
-    
+
+    # Cross-request cache for the SDK fallback
+    try:
+        token, _ = get_databricks_token_with_source()
+    except Exception:
+        token = None
+    digest = None
+    if token:
+        digest = hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+        with _user_email_cache_lock:
+            entry = _user_email_cache.get(digest)
+            if entry is not None and entry[0] > time.time():
+                _user_email_cache.move_to_end(digest)
+                return entry[1]
+
     # Try to get from WorkspaceClient
     try:
         w = get_workspace_client()
         me = w.current_user.me()
-        return me.user_name
     except Exception as e:
         log('warning', f"Could not get current user: {e}")
         return None
 
+    if digest is not None:
+        with _user_email_cache_lock:
+            _user_email_cache[digest] = (time.time() + _USER_EMAIL_TTL_SECONDS, me.user_name)
+            while len(_user_email_cache) > _USER_EMAIL_CACHE_MAX:
+                _user_email_cache.popitem(last=False)
+    return me.user_name
+
 
 def resolve_secret_value(secret_ref: dict, obo_token: str | None = None) -> str | None:
     """
@@ -962,7 +1366,6 @@ def resolve_secret_value(secret_ref: dict, obo_token: str | None = None) -> str
             return None
         
         # Call Secrets API
-        import requests
         api_url = f"{host}/api/2.0/secrets/get"
         headers = {
             'Authorization': f'Bearer {token}',
@@ -974,7 +1377,7 @@ def resolve_secret_value(secret_ref: dict, obo_token: str | None = None) -> str
         }
         
         log('info', f"Resolving secret {scope}/{secret_key}")
-        response = requests.get(api_url, headers=headers, params=payload, timeout=30)
+        response = _http_session.get(api_url, headers=headers, params=payload, timeout=30)
         
         if response.status_code == 200:
             data = response.json()
@@ -1062,21 +1465,32 @@ def sort_by_owner(items: list, current_user: str | None) -> list:
     """
     Sort items so that ones owned by the current user appear first.
     Within each group, sort alphabetically by name.
+
+    Decorate-sort-undecorate: the key parts are lowercased once per item
+    (O(N)) instead of inside the comparator, which matters on multi-thousand
+    item catalog listings.
     """
     if not current_user:
         # Just sort alphabetically if we don't know the user
-        return sorted(items, key=lambda x: x.get('name', '').lower())
-    
+        decorated = [((item.get('name') or '').lower(), i, item) for i, item in enumerate(items)]
+        decorated.sort(key=itemgetter(0, 1))
+        return [d[2] for d in decorated]
+
     current_user_lower = current_user.lower()
-    
-    def sort_key(item):
-        owner = (item.get('owner') or '').lower()
-        name = (item.get('name') or '').lower()
-        # Items owned by current user get priority (0), others get (1)
-        is_owned = 0 if owner == current_user_lower else 1
-        return (is_owned, name)
-    
-    return sorted(items, key=sort_key)
+
+    # Items owned by current user get priority (False sorts before True);
+    # the index keeps the sort from ever comparing the item dicts themselves.
+    decorated = [
+        (
+            (item.get('owner') or '').lower() != current_user_lower,
+            (item.get('name') or '').lower(),
+            i,
+            item,
+        )
+        for i, item in enumerate(items)
+    ]
+    decorated.sort(key=itemgetter(0, 1, 2))
+    return [d[3] for d in decorated]
 
 
 @app.route('/api/uc/catalogs')
@@ -1101,10 +1515,10 @@ def list_catalogs():
         result = sort_by_owner(result, current_user)
         
         log('info', f"Listed {len(result)} catalogs (user: {current_user})")
-        return jsonify({'catalogs': result, 'current_user': current_user})
+        return fast_jsonify({'catalogs': result, 'current_user': current_user})
     except Exception as e:
         log('error', f"Error listing catalogs: {e}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/schemas')
@@ -1112,7 +1526,7 @@ def list_schemas():
     """List schemas in a catalog using WorkspaceClient, sorted by ownership."""
     catalog = request.args.get('catalog')
     if not catalog:
-        return jsonify({'error': 'catalog parameter required'}), 400
+        return fast_jsonify({'error': 'catalog parameter required'}, 400)
     
     try:
         w = get_workspace_client()
@@ -1134,10 +1548,10 @@ def list_schemas():
         result = sort_by_owner(result, current_user)
         
         log('info', f"Listed {len(result)} schemas in catalog {catalog} (user: {current_user})")
-        return jsonify({'schemas': result, 'current_user': current_user})
+        return fast_jsonify({'schemas': result, 'current_user': current_user})
     except Exception as e:
         log('error', f"Error listing schemas in {catalog}: {e}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/tables')
@@ -1146,7 +1560,7 @@ def list_tables():
     catalog = request.args.get('catalog')
     schema = request.args.get('schema')
     if not catalog or not schema:
-        return jsonify({'error': 'catalog and schema parameters required'}), 400
+        return fast_jsonify({'error': 'catalog and schema parameters required'}, 400)
     
     try:
         w = get_workspace_client()
@@ -1168,10 +1582,10 @@ def list_tables():
         result = sort_by_owner(result, current_user)
         
         log('info', f"Listed {len(result)} tables in {catalog}.{schema}")
-        return jsonify({'tables': result})
+        return fast_jsonify({'tables': result})
     except Exception as e:
         log('error', f"Error listing tables in {catalog}.{schema}: {e}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/table-columns')
@@ -1182,7 +1596,7 @@ def get_table_columns():
     table = request.args.get('table')
     
     if not catalog or not schema or not table:
-        return jsonify({'error': 'catalog, schema, and table parameters required'}), 400
+        return fast_jsonify({'error': 'catalog, schema, and table parameters required'}, 400)
     
     try:
         w = get_workspace_client()
@@ -1203,10 +1617,10 @@ def get_table_columns():
                 })
         
         log('info', f"Retrieved {len(columns)} columns from {full_name}")
-        return jsonify({'columns': columns})
+        return fast_jsonify({'columns': columns})
     except Exception as e:
         log('error', f"Error getting columns for {catalog}.{schema}.{table}: {e}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/functions')
@@ -1215,7 +1629,7 @@ def list_functions():
     catalog = request.args.get('catalog')
     schema = request.args.get('schema')
     if not catalog or not schema:
-        return jsonify({'error': 'catalog and schema parameters required'}), 400
+        return fast_jsonify({'error': 'catalog and schema parameters required'}, 400)
     
     try:
         w = get_workspace_client()
@@ -1243,10 +1657,10 @@ def list_functions():
         result = sort_by_owner(result, current_user)
         
         log('info', f"Listed {len(result)} functions in {catalog}.{schema}")
-        return jsonify({'functions': result})
+        return fast_jsonify({'functions': result})
     except Exception as e:
         log('error', f"Error listing functions in {catalog}.{schema}: {e}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/volumes')
@@ -1255,7 +1669,7 @@ def list_volumes():
     catalog = request.args.get('catalog')
     schema = request.args.get('schema')
     if not catalog or not schema:
-        return jsonify({'error': 'catalog and schema parameters required'}), 400
+        return fast_jsonify({'error': 'catalog and schema parameters required'}, 400)
     
     try:
         w = get_workspace_client()
@@ -1277,10 +1691,10 @@ def list_volumes():
         result = sort_by_owner(result, current_user)
         
         log('info', f"Listed {len(result)} volumes in {catalog}.{schema}")
-        return jsonify({'volumes': result})
+        return fast_jsonify({'volumes': result})
     except Exception as e:
         log('error', f"Error listing volumes in {catalog}.{schema}: {e}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/registered-models')
@@ -1306,10 +1720,63 @@ def list_registered_models():
         result = sort_by_owner(result, current_user)
         
         log('info', f"Listed {len(result)} registered models")
-        return jsonify({'models': result})
+        return fast_jsonify({'models': result})
     except Exception as e:
         log('error', f"Error listing registered models: {e}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
+
+
+# Worker pool for the per-prompt version lookups in the REST fallback of
+# list_prompts: the calls are independent, so fanning them out collapses N
+# serial round-trips into ceil(N/16) * RTT.
+_PROMPT_VERSIONS_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix='prompt-versions')
+
+
+def _fetch_prompt_versions(host: str, headers: dict, prompt_full_name: str) -> dict | None:
+    """Fetch version/alias info for one prompt via the REST API.
+
+    Returns a dict with 'aliases', 'latest_version' and 'versions' keys, or
+    None when the lookup fails (the listing entry keeps its defaults).
+    """
+    try:
+        # Keep dots unencoded as they're part of the catalog.schema.name format
+        encoded_name = urllib.parse.quote(prompt_full_name, safe='.')
+        versions_url = f"{host}/api/2.0/mlflow/unity-catalog/prompts/{encoded_name}/versions/search"
+        versions_response = _http_session.get(versions_url, headers=headers, timeout=30)
+
+        if versions_response.status_code != 200:
+            return None
+
+        versions_data = versions_response.json()
+        # Handle both wrapped and unwrapped response formats
+        versions_list = versions_data.get('prompt_versions', []) if isinstance(versions_data, dict) else versions_data
+
+        all_aliases = set()
+        version_infos = []
+        latest_version = 0
+
+        for v in versions_list:
+            version_val = v.get('version')
+            version_num = int(version_val) if version_val is not None else 0
+            v_aliases = v.get('aliases', [])
+            all_aliases.update(v_aliases)
+
+            version_infos.append({
+                'version': str(version_num),
+                'aliases': v_aliases,
+            })
+
+            if version_num > latest_version:
+                latest_version = version_num
+
+        return {
+            'aliases': sorted(all_aliases),
+            'latest_version': str(latest_version) if latest_version > 0 else None,
+            'versions': sorted(version_infos, key=lambda x: int(x['version']) if x['version'] else 0, reverse=True),
+        }
+    except Exception as ve:
+        log('debug', f"Could not get versions for {prompt_full_name}: {ve}")
+        return None
 
 
 @app.route('/api/uc/prompts', methods=['GET', 'POST'])
@@ -1336,7 +1803,7 @@ def list_prompts():
         service_principal = None
     
     if not catalog or not schema:
-        return jsonify({'error': 'catalog and schema parameters required'}), 400
+        return fast_jsonify({'error': 'catalog and schema parameters required'}, 400)
     
     try:
         current_user = get_current_user_email()
@@ -1358,10 +1825,10 @@ def list_prompts():
         if not host:
             log('warning', "No Databricks host available. "
                          f"DATABRICKS_HOST env: {os.environ.get('DATABRICKS_HOST', 'NOT SET')}")
-            return jsonify({
+            return fast_jsonify({
                 'error': 'No Databricks host configured',
                 'help': 'Set DATABRICKS_HOST environment variable or use OAuth login.'
-            }), 401
+            }, 401)
         
         # Normalize host (remove trailing slash)
         host = host.rstrip('/')
@@ -1388,6 +1855,10 @@ def list_prompts():
             else:
                 log('warning', f"Failed to resolve service principal credentials")
         
+        # Serialize the env-mutating span: with threaded workers, concurrent
+        # requests (or a running deployment) would otherwise stomp each
+        # other's credentials mid-call.
+        _env_mutation_lock.acquire()
         # Save original environment variables to restore later
         orig_env = {}
         env_vars_to_manage = ['DATABRICKS_HOST', 'DATABRICKS_TOKEN', 'DATABRICKS_CLIENT_ID', 'DATABRICKS_CLIENT_SECRET']
@@ -1417,7 +1888,7 @@ def list_prompts():
                     log('info', f"Set DATABRICKS_TOKEN from {token_source}")
                 else:
                     log('warning', "No authentication token available")
-                    return jsonify({'error': 'No authentication token available'}), 401
+                    return fast_jsonify({'error': 'No authentication token available'}, 401)
             
             # Use MLflow SDK to search prompts
             import mlflow
@@ -1481,14 +1952,11 @@ def list_prompts():
                     result.append(prompt_info)
                 
             except Exception as mlflow_err:
-                import traceback
                 log('warning', f"MLflow SDK error: {mlflow_err}")
                 log('warning', f"MLflow SDK traceback: {traceback.format_exc()}")
                 # Fall back to REST API
                 log('info', "Falling back to REST API for prompts")
                 
-                import requests
-                
                 # Get a token for REST API
                 if use_sp_auth:
                     # Get OAuth token for the service principal
@@ -1499,19 +1967,19 @@ def list_prompts():
                         'client_secret': sp_client_secret,
                         'scope': 'all-apis',
                     }
-                    oauth_response = requests.post(oauth_url, data=oauth_data, timeout=30)
+                    oauth_response = _http_session.post(oauth_url, data=oauth_data, timeout=30)
                     if oauth_response.status_code == 200:
                         oauth_result = oauth_response.json()
                         token = oauth_result.get('access_token')
                         log('info', "Got OAuth token for REST API fallback")
                     else:
                         log('error', f"OAuth failed: {oauth_response.status_code} - {oauth_response.text}")
-                        return jsonify({'error': f'OAuth failed: {oauth_response.text}'}), 401
+                        return fast_jsonify({'error': f'OAuth failed: {oauth_response.text}'}, 401)
                 else:
                     token, _ = get_databricks_token_with_source()
                 
                 if not token:
-                    return jsonify({'error': 'No authentication token available'}), 401
+                    return fast_jsonify({'error': 'No authentication token available'}, 401)
                 
                 headers = {
                     'Authorization': f'Bearer {token}',
@@ -1524,7 +1992,7 @@ def list_prompts():
                     'max_results': 100,
                 }
                 
-                response = requests.post(api_url, headers=headers, json=payload, timeout=30)
+                response = _http_session.post(api_url, headers=headers, json=payload, timeout=30)
                 log('info', f"REST API response status: {response.status_code}")
                 log('debug', f"REST API response headers: {dict(response.headers)}")
                 log('debug', f"REST API response text (first 500 chars): {response.text[:500] if response.text else 'EMPTY'}")
@@ -1532,21 +2000,26 @@ def list_prompts():
                 if response.status_code == 200:
                     if not response.text or not response.text.strip():
                         log('error', "REST API returned empty response")
-                        return jsonify({'error': 'REST API returned empty response'}), 500
+                        return fast_jsonify({'error': 'REST API returned empty response'}, 500)
                     try:
                         data = response.json()
                     except Exception as json_err:
                         log('error', f"Failed to parse REST API response as JSON: {json_err}")
                         log('error', f"Raw response: {response.text[:1000]}")
-                        return jsonify({'error': f'Failed to parse response: {json_err}'}), 500
+                        return fast_jsonify({'error': f'Failed to parse response: {json_err}'}, 500)
                     prompts_data = data.get('prompts', [])
                     log('info', f"REST API returned {len(prompts_data)} prompts")
                     
+                    # Fan the independent per-prompt version lookups out across
+                    # the worker pool; futures are zipped back to their entries
+                    # so ordering is preserved.
+                    entries = []
+                    futures = []
                     for p in prompts_data:
                         prompt_full_name = p.get('name', '')
                         short_name = prompt_full_name.split('.')[-1] if '.' in prompt_full_name else prompt_full_name
-                        
-                        prompt_info = {
+
+                        entries.append({
                             'name': short_name,
                             'full_name': prompt_full_name,
                             'description': p.get('description', ''),
@@ -1554,56 +2027,25 @@ def list_prompts():
                             'aliases': [],
                             'latest_version': None,
                             'versions': [],
-                        }
-                        
-                        # Get versions for this prompt
-                        try:
-                            # Correct endpoint format: /api/2.0/mlflow/unity-catalog/prompts/{prompt-name}/versions/search
-                            from urllib.parse import quote
-                            # Keep dots unencoded as they're part of the catalog.schema.name format
-                            encoded_name = quote(prompt_full_name, safe='.')
-                            versions_url = f"{host}/api/2.0/mlflow/unity-catalog/prompts/{encoded_name}/versions/search"
-                            versions_response = requests.get(versions_url, headers=headers, timeout=30)
-                            
-                            if versions_response.status_code == 200:
-                                versions_data = versions_response.json()
-                                # Handle both wrapped and unwrapped response formats
-                                versions_list = versions_data.get('prompt_versions', []) if isinstance(versions_data, dict) else versions_data
-                                
-                                all_aliases = set()
-                                version_infos = []
-                                latest_version = 0
-                                
-                                for v in versions_list:
-                                    version_val = v.get('version')
-                                    version_num = int(version_val) if version_val is not None else 0
-                                    v_aliases = v.get('aliases', [])
-                                    all_aliases.update(v_aliases)
-                                    
-                                    version_infos.append({
-                                        'version': str(version_num),
-                                        'aliases': v_aliases,
-                                    })
-                                    
-                                    if version_num > latest_version:
-                                        latest_version = version_num
-                                
-                                prompt_info['aliases'] = sorted(list(all_aliases))
-                                prompt_info['latest_version'] = str(latest_version) if latest_version > 0 else None
-                                prompt_info['versions'] = sorted(version_infos, key=lambda x: int(x['version']) if x['version'] else 0, reverse=True)
-                        except Exception as ve:
-                            log('debug', f"Could not get versions for {prompt_full_name}: {ve}")
-                        
-                        result.append(prompt_info)
-                    
+                        })
+                        futures.append(_PROMPT_VERSIONS_EXECUTOR.submit(
+                            _fetch_prompt_versions, host, headers, prompt_full_name))
+
+                    for prompt_info, future in zip(entries, futures):
+                        versions = future.result()
+                        if versions:
+                            prompt_info.update(versions)
+
+                    result.extend(entries)
+
                     log('info', f"Found {len(result)} prompts via REST API")
                     
                 elif response.status_code == 403:
                     log('error', f"Permission denied (403): {response.text}")
-                    return jsonify({'error': f'Permission denied to access prompts. Response: {response.text}'}), 403
+                    return fast_jsonify({'error': f'Permission denied to access prompts. Response: {response.text}'}, 403)
                 else:
                     log('error', f"REST API failed with status {response.status_code}: {response.text}")
-                    return jsonify({'error': f'Failed to search prompts: {response.status_code} - {response.text}'}), response.status_code
+                    return fast_jsonify({'error': f'Failed to search prompts: {response.status_code} - {response.text}'}, response.status_code)
         
         finally:
             # Restore original environment variables
@@ -1613,18 +2055,18 @@ def list_prompts():
                 elif var in os.environ:
                     del os.environ[var]
             log('debug', "Restored original environment variables")
+            _env_mutation_lock.release()
         
         # Sort by name alphabetically
         result = sorted(result, key=lambda x: x['name'].lower())
         
         log('info', f"Returning {len(result)} prompts in {catalog}.{schema}")
-        return jsonify({'prompts': result})
+        return fast_jsonify({'prompts': result})
         
     except Exception as e:
-        import traceback
         log('error', f"Error listing prompts in {catalog}.{schema}: {e}")
         log('error', f"Traceback: {traceback.format_exc()}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/prompt-details', methods=['GET', 'POST'])
@@ -1654,7 +2096,7 @@ def get_prompt_details():
     log('info', f"Prompt details request: name={full_name}, has_service_principal={service_principal is not None}")
     
     if not full_name:
-        return jsonify({'error': 'name parameter required'}), 400
+        return fast_jsonify({'error': 'name parameter required'}, 400)
     
     try:
         # Get host from DATABRICKS_HOST environment variable
@@ -1663,10 +2105,10 @@ def get_prompt_details():
         if not host:
             log('warning', f"No Databricks host available. "
                          f"DATABRICKS_HOST env: {os.environ.get('DATABRICKS_HOST', 'NOT SET')}")
-            return jsonify({
+            return fast_jsonify({
                 'error': 'No Databricks host configured',
                 'help': 'Set DATABRICKS_HOST environment variable.'
-            }), 401
+            }, 401)
         
         # Normalize host
         host = host.rstrip('/')
@@ -1698,6 +2140,10 @@ def get_prompt_details():
                 use_sp_auth = True
                 log('info', f"Resolved service principal credentials: client_id={sp_client_id[:8]}...")
         
+        # Serialize the env-mutating span: with threaded workers, concurrent
+        # requests (or a running deployment) would otherwise stomp each
+        # other's credentials mid-call.
+        _env_mutation_lock.acquire()
         # Save original environment variables to restore later
         orig_env = {}
         env_vars_to_manage = ['DATABRICKS_HOST', 'DATABRICKS_TOKEN', 'DATABRICKS_CLIENT_ID', 'DATABRICKS_CLIENT_SECRET']
@@ -1724,12 +2170,11 @@ def get_prompt_details():
                     log('info', f"Set DATABRICKS_TOKEN from {token_source}")
                 else:
                     log('warning', "No authentication token available")
-                    return jsonify({'error': 'No authentication token available'}), 401
+                    return fast_jsonify({'error': 'No authentication token available'}, 401)
             
             log('info', f"Getting details for prompt: {full_name}")
             
             # Use REST API to get prompt metadata (including aliases and tags)
-            import requests
             from urllib.parse import quote
             
             # Get token for REST API call
@@ -1742,7 +2187,7 @@ def get_prompt_details():
                     'client_secret': sp_client_secret,
                     'scope': 'all-apis',
                 }
-                oauth_response = requests.post(oauth_url, data=oauth_data, timeout=30)
+                oauth_response = _http_session.post(oauth_url, data=oauth_data, timeout=30)
                 if oauth_response.status_code == 200:
                     rest_token = oauth_response.json().get('access_token')
                 else:
@@ -1751,7 +2196,7 @@ def get_prompt_details():
                 rest_token, _ = get_databricks_token_with_source()
             
             if not rest_token:
-                return jsonify({'error': 'No authentication token available'}), 401
+                return fast_jsonify({'error': 'No authentication token available'}, 401)
             
             headers = {
                 'Authorization': f'Bearer {rest_token}',
@@ -1763,7 +2208,7 @@ def get_prompt_details():
             # First, get prompt metadata (including aliases) from /prompts/{prompt-name}
             prompt_url = f"{host}/api/2.0/mlflow/unity-catalog/prompts/{encoded_name}"
             log('info', f"Calling REST API for prompt metadata: GET {prompt_url}")
-            prompt_response = requests.get(prompt_url, headers=headers, timeout=30)
+            prompt_response = _http_session.get(prompt_url, headers=headers, timeout=30)
             
             if prompt_response.status_code == 200:
                 prompt_data = prompt_response.json()
@@ -1814,7 +2259,7 @@ def get_prompt_details():
             
             try:
                 # Use POST with empty JSON body - this is required by the API
-                versions_response = requests.post(
+                versions_response = _http_session.post(
                     versions_url, 
                     headers={**headers, 'Content-Type': 'application/json'},
                     json={},  # Empty body for search
@@ -1890,7 +2335,7 @@ def get_prompt_details():
                 log('error', f"=== VERSIONS API FAILED - No response ===")
             
             log('info', f"Retrieved details for prompt {full_name}: {len(result['versions'])} versions, {len(result['aliases'])} aliases, {len(result['tags'])} tags")
-            return jsonify(result)
+            return fast_jsonify(result)
             
         finally:
             # Restore original environment variables
@@ -1900,12 +2345,12 @@ def get_prompt_details():
                 elif var in os.environ:
                     del os.environ[var]
             log('debug', "Restored original environment variables")
+            _env_mutation_lock.release()
         
     except Exception as e:
-        import traceback
         log('error', f"Error getting prompt details for {full_name}: {e}")
         log('error', f"Traceback: {traceback.format_exc()}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/prompt-template', methods=['GET', 'POST'])
@@ -1937,7 +2382,7 @@ def get_prompt_template():
         service_principal = None
     
     if not full_name:
-        return jsonify({'error': 'name parameter required'}), 400
+        return fast_jsonify({'error': 'name parameter required'}, 400)
     
     try:
         # Get host
@@ -1945,9 +2390,9 @@ def get_prompt_template():
         
         if not host:
             log('warning', f"No Databricks host available.")
-            return jsonify({
+            return fast_jsonify({
                 'error': 'No Databricks host configured',
-            }), 401
+            }, 401)
         
         # Normalize host
         host = host.rstrip('/')
@@ -1967,6 +2412,10 @@ def get_prompt_template():
                 use_sp_auth = True
                 log('info', f"Resolved service principal credentials: client_id={sp_client_id[:8]}...")
         
+        # Serialize the env-mutating span: with threaded workers, concurrent
+        # requests (or a running deployment) would otherwise stomp each
+        # other's credentials mid-call.
+        _env_mutation_lock.acquire()
         # Save original environment variables to restore later
         orig_env: dict[str, str | None] = {}
         env_vars_to_manage = ['DATABRICKS_HOST', 'DATABRICKS_TOKEN', 'DATABRICKS_CLIENT_ID', 'DATABRICKS_CLIENT_SECRET']
@@ -1986,7 +2435,6 @@ def get_prompt_template():
             token: str | None = None
             if use_sp_auth:
                 # Get OAuth token for the service principal
-                import requests as req
                 oauth_url = f"{host}/oidc/v1/token"
                 oauth_data = {
                     'grant_type': 'client_credentials',
@@ -1994,23 +2442,22 @@ def get_prompt_template():
                     'client_secret': sp_client_secret,
                     'scope': 'all-apis',
                 }
-                oauth_response = req.post(oauth_url, data=oauth_data, timeout=30)
+                oauth_response = _http_session.post(oauth_url, data=oauth_data, timeout=30)
                 if oauth_response.status_code == 200:
                     token = oauth_response.json().get('access_token')
                     log('info', "Got OAuth token for service principal")
                 else:
                     log('error', f"OAuth failed: {oauth_response.status_code} - {oauth_response.text}")
-                    return jsonify({'error': f'OAuth failed: {oauth_response.text}'}), 401
+                    return fast_jsonify({'error': f'OAuth failed: {oauth_response.text}'}, 401)
             else:
                 token, token_source = get_databricks_token_with_source()
                 
             if not token:
                 log('warning', "No authentication token available")
-                return jsonify({'error': 'No authentication token available'}), 401
+                return fast_jsonify({'error': 'No authentication token available'}, 401)
             
             # Skip MLflow SDK entirely - go straight to REST API which is more reliable
             # MLflow SDK has internal int() parsing bugs with some version formats
-            import requests as req
             
             prompt = None
             load_error = None
@@ -2029,13 +2476,13 @@ def get_prompt_template():
                 # First, get prompt metadata to find the latest version and aliases
                 prompt_url = f"{host}/api/2.0/mlflow/unity-catalog/prompts/{full_name}"
                 log('info', f"Calling REST API: GET {prompt_url}")
-                prompt_response = req.get(prompt_url, headers=headers, timeout=30)
+                prompt_response = _http_session.get(prompt_url, headers=headers, timeout=30)
                 
                 log('info', f"Prompt metadata response: status={prompt_response.status_code}")
                 
                 if prompt_response.status_code != 200:
                     log('error', f"Prompt metadata error: {prompt_response.text[:500] if prompt_response.text else 'empty'}")
-                    return jsonify({'error': f'Failed to get prompt metadata: {prompt_response.status_code}'}), prompt_response.status_code
+                    return fast_jsonify({'error': f'Failed to get prompt metadata: {prompt_response.status_code}'}, prompt_response.status_code)
                 
                 prompt_meta = prompt_response.json()
                 
@@ -2078,10 +2525,10 @@ def get_prompt_template():
                     if alias in alias_version_map:
                         target_version_num = int(alias_version_map[alias])
                     else:
-                        return jsonify({
+                        return fast_jsonify({
                             'error': f"Alias '{alias}' not found for prompt {full_name}",
                             'alias_not_found': True
-                        }), 404
+                        }, 404)
                 
                 if not target_version_num:
                     target_version_num = version_count
@@ -2111,17 +2558,16 @@ def get_prompt_template():
                     }
                     
                     log('info', f"Successfully loaded template for {full_name}, version={loaded_version}")
-                    return jsonify(result)
+                    return fast_jsonify(result)
                     
                 except Exception as mlflow_err:
                     log('error', f"MLflow load_prompt error: {mlflow_err}")
-                    return jsonify({'error': str(mlflow_err)}), 500
+                    return fast_jsonify({'error': str(mlflow_err)}, 500)
                     
             except Exception as rest_err:
                 log('error', f"REST API error: {rest_err}")
-                import traceback
                 log('error', f"Traceback: {traceback.format_exc()}")
-                return jsonify({'error': str(rest_err)}), 500
+                return fast_jsonify({'error': str(rest_err)}, 500)
                     
         finally:
             # Restore original environment variables
@@ -2130,12 +2576,12 @@ def get_prompt_template():
                     os.environ[var] = orig_env[var]
                 elif var in os.environ:
                     del os.environ[var]
+            _env_mutation_lock.release()
         
     except Exception as e:
-        import traceback
         log('error', f"Error getting prompt template for {full_name}: {e}")
         log('error', f"Traceback: {traceback.format_exc()}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/register-prompt', methods=['POST'])
@@ -2166,13 +2612,13 @@ def register_prompt():
     
     # Validate required fields
     if not name:
-        return jsonify({'error': 'name parameter required'}), 400
+        return fast_jsonify({'error': 'name parameter required'}, 400)
     if not catalog_name:
-        return jsonify({'error': 'catalog_name parameter required'}), 400
+        return fast_jsonify({'error': 'catalog_name parameter required'}, 400)
     if not schema_name:
-        return jsonify({'error': 'schema_name parameter required'}), 400
+        return fast_jsonify({'error': 'schema_name parameter required'}, 400)
     if not template:
-        return jsonify({'error': 'template parameter required'}), 400
+        return fast_jsonify({'error': 'template parameter required'}, 400)
     
     # Build full prompt name
     full_name = f"{catalog_name}.{schema_name}.{name}"
@@ -2185,9 +2631,9 @@ def register_prompt():
         
         if not host:
             log('warning', f"No Databricks host available.")
-            return jsonify({
+            return fast_jsonify({
                 'error': 'No Databricks host configured',
-            }), 401
+            }, 401)
         
         # Normalize host
         host = host.rstrip('/')
@@ -2207,6 +2653,10 @@ def register_prompt():
                 use_sp_auth = True
                 log('info', f"Resolved service principal credentials: client_id={sp_client_id[:8]}...")
         
+        # Serialize the env-mutating span: with threaded workers, concurrent
+        # requests (or a running deployment) would otherwise stomp each
+        # other's credentials mid-call.
+        _env_mutation_lock.acquire()
         # Save original environment variables to restore later
         orig_env: dict[str, str | None] = {}
         env_vars_to_manage = ['DATABRICKS_HOST', 'DATABRICKS_TOKEN', 'DATABRICKS_CLIENT_ID', 'DATABRICKS_CLIENT_SECRET']
@@ -2235,7 +2685,7 @@ def register_prompt():
                     log('info', f"Set DATABRICKS_TOKEN from {token_source}")
                 else:
                     log('warning', "No authentication token available")
-                    return jsonify({'error': 'No authentication token available'}), 401
+                    return fast_jsonify({'error': 'No authentication token available'}, 401)
             
             # Use MLflow SDK to register the prompt
             import mlflow
@@ -2293,7 +2743,7 @@ def register_prompt():
                 'message': f"Successfully registered prompt '{full_name}' version {prompt_version.version}",
             }
             
-            return jsonify(result)
+            return fast_jsonify(result)
             
         finally:
             # Restore original environment variables
@@ -2302,12 +2752,12 @@ def register_prompt():
                     os.environ[var] = orig_env[var]
                 elif var in os.environ:
                     del os.environ[var]
+            _env_mutation_lock.release()
         
     except Exception as e:
-        import traceback
         log('error', f"Error registering prompt {full_name}: {e}")
         log('error', f"Traceback: {traceback.format_exc()}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/genie-spaces')
@@ -2333,7 +2783,7 @@ def list_genie_spaces():
         
         if not token or not host:
             log('error', "No token or host available for Genie spaces API")
-            return jsonify({'error': 'Authentication required'}), 401
+            return fast_jsonify({'error': 'Authentication required'}, 401)
         
         log('info', f"Using {token_source} token for Genie spaces API")
         
@@ -2354,7 +2804,7 @@ def list_genie_spaces():
             log('info', f"Page {page_count}: Calling Genie spaces API with {token_source} token")
             
             try:
-                resp = http_requests.get(api_url, headers=headers, timeout=30)
+                resp = _http_session.get(api_url, headers=headers, timeout=30)
                 log('info', f"Genie spaces API response status: {resp.status_code}")
                 
                 if resp.status_code == 200:
@@ -2422,12 +2872,11 @@ def list_genie_spaces():
         result.sort(key=lambda space: (space.get('title') or '').lower())
         
         log('info', f"Returning {len(result)} Genie spaces (sorted alphabetically)")
-        return jsonify({'spaces': result, 'current_user': current_user})
+        return fast_jsonify({'spaces': result, 'current_user': current_user})
     except Exception as e:
         log('error', f"Error listing Genie spaces: {e}")
-        import traceback
         log('error', traceback.format_exc())
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/apps')
@@ -2458,12 +2907,11 @@ def list_apps():
             for app in apps
         ]
         log('info', f"Listed {len(result)} Databricks Apps")
-        return jsonify({'apps': result, 'current_user': current_user})
+        return fast_jsonify({'apps': result, 'current_user': current_user})
     except Exception as e:
         log('error', f"Error listing Databricks Apps: {e}")
-        import traceback
         log('error', traceback.format_exc())
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/databases')
@@ -2514,10 +2962,10 @@ def list_databases():
         # Sort by owner (current user's databases first)
         result = sort_by_owner(result, current_user)
         
-        return jsonify({'databases': result, 'current_user': current_user})
+        return fast_jsonify({'databases': result, 'current_user': current_user})
     except Exception as e:
         log('error', f"Error listing databases: {e}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/postgres/projects')
@@ -2545,10 +2993,10 @@ def list_lakebase_projects():
             log('error', f"postgres.list_projects() failed: {e}")
 
         result = sort_by_owner(result, current_user)
-        return jsonify({'projects': result, 'current_user': current_user})
+        return fast_jsonify({'projects': result, 'current_user': current_user})
     except Exception as e:
         log('error', f"Error listing Lakebase projects: {e}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/postgres/branches')
@@ -2557,7 +3005,7 @@ def list_lakebase_branches():
     try:
         project = request.args.get('project')
         if not project:
-            return jsonify({'error': 'project query parameter is required'}), 400
+            return fast_jsonify({'error': 'project query parameter is required'}, 400)
 
         w = get_workspace_client()
         log('debug', f"Listing branches for Lakebase project: {project}")
@@ -2580,10 +3028,10 @@ def list_lakebase_branches():
         except Exception as e:
             log('debug', f"postgres.list_branches() failed: {e}")
 
-        return jsonify({'branches': result})
+        return fast_jsonify({'branches': result})
     except Exception as e:
         log('error', f"Error listing Lakebase branches: {e}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/connections')
@@ -2614,10 +3062,10 @@ def list_uc_connections():
         # Sort by owner (current user's connections first)
         result = sort_by_owner(result, current_user)
         
-        return jsonify({'connections': result, 'current_user': current_user})
+        return fast_jsonify({'connections': result, 'current_user': current_user})
     except Exception as e:
         log('error', f"Error listing UC connections: {e}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/serving-endpoints')
@@ -2638,10 +3086,10 @@ def list_serving_endpoints():
             for e in endpoints
         ]
         log('info', f"Listed {len(result)} serving endpoints")
-        return jsonify({'endpoints': result})
+        return fast_jsonify({'endpoints': result})
     except Exception as e:
         log('error', f"Error listing serving endpoints: {e}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/sql-warehouses')
@@ -2673,10 +3121,10 @@ def list_sql_warehouses():
         result.sort(key=lambda x: (state_priority.get(x.get('state'), 99), x.get('name', '')))
         
         log('info', f"Listed {len(result)} SQL warehouses")
-        return jsonify({'warehouses': result})
+        return fast_jsonify({'warehouses': result})
     except Exception as e:
         log('error', f"Error listing SQL warehouses: {e}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/vector-search-endpoints')
@@ -2698,13 +3146,13 @@ def list_vector_search_endpoints():
                 for e in endpoints
             ]
             log('info', f"Listed {len(result)} vector search endpoints")
-            return jsonify({'endpoints': result})
+            return fast_jsonify({'endpoints': result})
         except AttributeError:
             log('warning', "Vector search API not available in this SDK version")
-            return jsonify({'endpoints': [], 'warning': 'Vector search API not available'})
+            return fast_jsonify({'endpoints': [], 'warning': 'Vector search API not available'})
     except Exception as e:
         log('error', f"Error listing vector search endpoints: {e}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/uc/vector-search-indexes')
@@ -2808,13 +3256,12 @@ def list_vector_search_indexes():
                 log('warning', f"Error fetching indexes for endpoint {ep_name}: {e}")
         
         log('info', f"Listed {len(all_indexes)} vector search indexes" + (f" for endpoint {endpoint}" if endpoint else ""))
-        return jsonify({'vector_indexes': all_indexes})
+        return fast_jsonify({'vector_indexes': all_indexes})
         
     except Exception as e:
         log('error', f"Error listing vector search indexes: {e}")
-        import traceback
         log('error', traceback.format_exc())
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}, 500)
 
 
 @app.route('/api/mcp/list-tools', methods=['POST'])
@@ -3026,7 +3473,6 @@ def list_mcp_tools_endpoint():
         
     except Exception as e:
         log('error', f'Error listing MCP tools: {e}')
-        import traceback
         log('error', traceback.format_exc())
         
         # Try to extract more detail from ExceptionGroup (Python 3.11+)
@@ -3048,6 +3494,194 @@ def list_mcp_tools_endpoint():
         }), 500
 
 
+# Negative cache for failed token verifications. Every bad token otherwise
+# costs two outbound Databricks calls, so a token spray amplifies load 2x;
+# repeats within the TTL are answered from memory without any outbound I/O.
+# Keys are hashes of token|host so raw tokens are never held in the cache.
+_VERIFY_NEG_CACHE: OrderedDict[str, tuple[float, dict, int]] = OrderedDict()
+_VERIFY_NEG_CACHE_LOCK = threading.Lock()
+_VERIFY_NEG_CACHE_TTL = 30.0
+_VERIFY_NEG_CACHE_MAX = 4096
+
+# Positive counterpart: a token that just verified successfully is near
+# certain to still be valid moments later, so reuse within a coarse TTL
+# bucket skips the outbound warehouses probe entirely. Kept shorter-lived
+# bound than the negative cache since entries are larger (full payloads).
+_VERIFY_POS_CACHE: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_VERIFY_POS_CACHE_TTL = 60.0
+_VERIFY_POS_CACHE_MAX = 1024
+
+# Optional cross-worker backing store for the verify cache. gunicorn runs
+# multiple workers, each with its own in-process cache, so a token spray gets
+# one outbound probe per worker. Pointing VERIFY_CACHE_REDIS_URL at a Redis
+# instance shares entries across workers; redis is not a hard dependency and
+# without the package (or the env var) the in-process LRU is used alone.
+_verify_redis = None
+if os.environ.get('VERIFY_CACHE_REDIS_URL'):
+    try:
+        import redis as _redis_module
+        _verify_redis = _redis_module.Redis.from_url(
+            os.environ['VERIFY_CACHE_REDIS_URL'], socket_timeout=0.25
+        )
+        log('info', "Verify cache backed by Redis for cross-worker sharing")
+    except ImportError:
+        log('warning', "VERIFY_CACHE_REDIS_URL set but redis package not installed; "
+                       "using in-process verify cache")
+
+
+def _verify_cache_key(token: str, host: str) -> str:
+    """
+    Build a cache key that does not retain the raw token.
+
+    blake2b is the fastest keyed hash in the stdlib and a 16-byte digest is
+    plenty for cache bucketing; this is not used for any security decision
+    beyond keeping raw tokens out of memory.
+    """
+    return hashlib.blake2b(f'{token}|{host}'.encode(), digest_size=16).hexdigest()
+
+
+def _get_cached_verify_success(token: str, host: str) -> dict | None:
+    """Return a cached successful verification payload for this token, if any."""
+    key = _verify_cache_key(token, host)
+    with _VERIFY_NEG_CACHE_LOCK:
+        entry = _VERIFY_POS_CACHE.get(key)
+        if not entry:
+            return None
+        expires_at, payload = entry
+        if time.monotonic() >= expires_at:
+            del _VERIFY_POS_CACHE[key]
+            return None
+        _VERIFY_POS_CACHE.move_to_end(key)
+        return payload
+
+
+def _cache_verify_success(token: str, host: str, payload: dict) -> None:
+    """Record a successful verification, evicting oldest entries at capacity."""
+    key = _verify_cache_key(token, host)
+    with _VERIFY_NEG_CACHE_LOCK:
+        _VERIFY_POS_CACHE[key] = (time.monotonic() + _VERIFY_POS_CACHE_TTL, payload)
+        _VERIFY_POS_CACHE.move_to_end(key)
+        while len(_VERIFY_POS_CACHE) > _VERIFY_POS_CACHE_MAX:
+            _VERIFY_POS_CACHE.popitem(last=False)
+
+
+def _get_cached_verify_failure(token: str, host: str) -> tuple[dict, int] | None:
+    """Return a cached (payload, status_code) failure for this token, if any."""
+    key = _verify_cache_key(token, host)
+    if _verify_redis is not None:
+        try:
+            raw = _verify_redis.get(f'verify:{key}')
+            if raw:
+                entry = json.loads(raw)
+                return entry['payload'], entry['status_code']
+            return None
+        except Exception as e:
+            log('warning', f"Redis verify-cache read failed, falling back to local: {e}")
+    with _VERIFY_NEG_CACHE_LOCK:
+        entry = _VERIFY_NEG_CACHE.get(key)
+        if not entry:
+            return None
+        expires_at, payload, status_code = entry
+        if time.monotonic() >= expires_at:
+            del _VERIFY_NEG_CACHE[key]
+            return None
+        _VERIFY_NEG_CACHE.move_to_end(key)
+        return payload, status_code
+
+
+def _cache_verify_failure(token: str, host: str, payload: dict, status_code: int) -> None:
+    """Record a 401/403 verification result, evicting oldest entries at capacity."""
+    key = _verify_cache_key(token, host)
+    if _verify_redis is not None:
+        try:
+            _verify_redis.setex(
+                f'verify:{key}',
+                int(_VERIFY_NEG_CACHE_TTL),
+                json.dumps({'payload': payload, 'status_code': status_code}),
+            )
+            return
+        except Exception as e:
+            log('warning', f"Redis verify-cache write failed, falling back to local: {e}")
+    with _VERIFY_NEG_CACHE_LOCK:
+        _VERIFY_NEG_CACHE[key] = (time.monotonic() + _VERIFY_NEG_CACHE_TTL, payload, status_code)
+        _VERIFY_NEG_CACHE.move_to_end(key)
+        while len(_VERIFY_NEG_CACHE) > _VERIFY_NEG_CACHE_MAX:
+            _VERIFY_NEG_CACHE.popitem(last=False)
+
+
+@lru_cache(maxsize=256)
+def _bearer_headers(token: str) -> dict[str, str]:
+    """
+    Authorization header dict for a token, built once per distinct token.
+
+    Tokens repeat heavily across requests (one per user/session), so caching
+    avoids re-allocating the f-string and dict on every outbound call.
+    """
+    return {'Authorization': f'Bearer {token}'}
+
+
+def _forwarded_user_identity() -> dict | None:
+    """
+    User identity from Databricks App forwarded headers, if present.
+
+    Returned in the same shape as the SCIM /Me payload fields we use, so it
+    can stand in for a SCIM lookup when the proxy already told us who the
+    user is.
+    """
+    email = request.headers.get('X-Forwarded-Email')
+    username = request.headers.get('X-Forwarded-Preferred-Username')
+    if not (email or username):
+        return None
+    return {
+        'userName': email or username,
+        'displayName': username or email,
+        'emails': [{'value': email}] if email else [],
+    }
+
+
+def _probe_warehouses_and_scim(host: str, token: str, scim: bool = True) -> tuple[http_requests.Response, dict | None]:
+    """
+    Issue the warehouses probe and (optionally) the SCIM /Me lookup concurrently.
+
+    Returns the warehouses response and the parsed SCIM user (or None if the
+    SCIM call failed or was skipped). Running both in parallel over the pooled
+    session means the SCIM round trip adds no latency when the token is valid.
+    """
+    headers = _bearer_headers(token)
+    # stream=True: the probe only needs the status line. On success the body
+    # (the full warehouses listing, potentially tens of kB) is never
+    # downloaded or parsed; failure paths still read it lazily for the error
+    # message.
+    warehouses_future = _VERIFY_EXECUTOR.submit(
+        _http_session.get,
+        f"{host}/api/2.0/sql/warehouses",
+        headers=headers,
+        timeout=10,
+        stream=True,
+    )
+    scim_future = None
+    if scim:
+        scim_future = _VERIFY_EXECUTOR.submit(
+            _http_session.get,
+            f"{host}/api/2.0/preview/scim/v2/Me",
+            headers=headers,
+            timeout=10,
+        )
+    resp = warehouses_future.result()
+    if resp.ok:
+        # Discard the unread streamed body so the connection is released
+        resp.close()
+    user_data = None
+    if scim_future is not None:
+        try:
+            user_resp = scim_future.result()
+            if user_resp.ok:
+                user_data = user_resp.json()
+        except (http_requests.exceptions.RequestException, ValueError) as e:
+            log('warning', f"SCIM call failed: {e}")
+    return resp, user_data
+
+
 @app.route('/api/auth/verify')
 def verify_auth():
     """
@@ -3081,32 +3715,29 @@ def verify_auth():
                 'help': 'Include X-Databricks-Host header with the request',
             }), 400
         
-        # Test the manual token directly
+        # Consult the verify caches before any outbound I/O
+        cached_success = _get_cached_verify_success(token, host)
+        if cached_success:
+            log('debug', "Returning cached verification success for manual token")
+            return jsonify(cached_success)
+        cached = _get_cached_verify_failure(token, host)
+        if cached:
+            cached_payload, cached_status = cached
+            log('debug', "Returning cached verification failure for manual token")
+            return jsonify(cached_payload), cached_status
+
+        # Test the manual token directly. When the Databricks App proxy
+        # already forwarded the user identity, skip the SCIM lookup entirely.
+        forwarded_user = _forwarded_user_identity()
         try:
-            resp = http_requests.get(
-                f"{host}/api/2.0/sql/warehouses",
-                headers={'Authorization': f'Bearer {token}'},
-                timeout=10,
-            )
-            
+            resp, user_data = _probe_warehouses_and_scim(host, token, scim=forwarded_user is None)
+            if forwarded_user is not None:
+                user_data = forwarded_user
+
             log('debug', f"Manual token test response: {resp.status_code}")
-            
+
             if resp.ok:
-                # Token works, try to get user info
-                user_data = None
-                try:
-                    user_resp = http_requests.get(
-                        f"{host}/api/2.0/preview/scim/v2/Me",
-                        headers={'Authorization': f'Bearer {token}'},
-                        timeout=10,
-                    )
-                    if user_resp.ok:
-                        user_data = user_resp.json()
-                        log('debug', f"SCIM response: {user_data}")
-                except Exception as e:
-                    log('warning', f"SCIM call failed: {e}")
-                
-                return jsonify({
+                success_payload = {
                     'authenticated': True,
                     'token_source': token_source,
                     'host_source': host_source,
@@ -3116,24 +3747,29 @@ def verify_auth():
                         'displayName': user_data.get('displayName') if user_data else 'Authenticated User',
                         'emails': user_data.get('emails', []) if user_data else [],
                     },
-                })
+                }
+                _cache_verify_success(token, host, success_payload)
+                return jsonify(success_payload)
             else:
                 try:
                     error_data = resp.json()
-                except Exception:
+                except ValueError:
                     error_data = {'message': resp.text[:200]}
                 
                 error_msg = error_data.get('message', '') or error_data.get('error', '') or resp.text[:200]
                 log('warning', f"Manual token verification failed: {resp.status_code} - {error_msg}")
-                
-                return jsonify({
+
+                failure_payload = {
                     'authenticated': False,
                     'error': f"Token validation failed: {error_msg}",
                     'status_code': resp.status_code,
                     'token_source': token_source,
-                }), resp.status_code
+                }
+                if resp.status_code in (401, 403):
+                    _cache_verify_failure(token, host, failure_payload, resp.status_code)
+                return jsonify(failure_payload), resp.status_code
                 
-        except Exception as e:
+        except http_requests.exceptions.RequestException as e:
             log('error', f"Manual token verification error: {e}")
             return jsonify({
                 'authenticated': False,
@@ -3185,31 +3821,28 @@ def verify_auth():
             'host_source': None,
         }), 400
     
-    # For manual tokens or SDK auth, try to call an API to verify
-    # Use the SQL warehouses list endpoint which has the 'sql' scope
+    # Consult the verify caches before any outbound I/O
+    cached_success = _get_cached_verify_success(token, host)
+    if cached_success:
+        log('debug', f"Returning cached verification success ({token_source} token)")
+        return jsonify(cached_success)
+    cached = _get_cached_verify_failure(token, host)
+    if cached:
+        cached_payload, cached_status = cached
+        log('debug', f"Returning cached verification failure ({token_source} token)")
+        return jsonify(cached_payload), cached_status
+
+    # For manual tokens or SDK auth, try to call an API to verify.
+    # Use the SQL warehouses list endpoint which has the 'sql' scope; reuse
+    # the forwarded identity instead of calling SCIM when available.
+    forwarded_user = _forwarded_user_identity()
     try:
-        resp = http_requests.get(
-            f"{host}/api/2.0/sql/warehouses",
-            headers={'Authorization': f'Bearer {token}'},
-            timeout=10,
-        )
-        
+        resp, user_data = _probe_warehouses_and_scim(host, token, scim=forwarded_user is None)
+        if forwarded_user is not None:
+            user_data = forwarded_user
+
         if resp.ok:
-            # Token works for SQL APIs, now try to get user info
-            # Try SCIM /Me but don't fail if it doesn't work
-            user_data = None
-            try:
-                user_resp = http_requests.get(
-                    f"{host}/api/2.0/preview/scim/v2/Me",
-                    headers={'Authorization': f'Bearer {token}'},
-                    timeout=10,
-                )
-                if user_resp.ok:
-                    user_data = user_resp.json()
-            except Exception:
-                pass  # SCIM might not be available, that's OK
-            
-            return jsonify({
+            success_payload = {
                 'authenticated': True,
                 'token_source': token_source,
                 'host_source': host_source,
@@ -3223,19 +3856,21 @@ def verify_auth():
                     'displayName': 'Authenticated User',
                     'emails': [],
                 },
-            })
+            }
+            _cache_verify_success(token, host, success_payload)
+            return jsonify(success_payload)
         else:
             # Try to parse error response
             try:
                 error_data = resp.json()
-            except Exception:
+            except ValueError:
                 error_data = {'message': resp.text}
             
             error_msg = error_data.get('message', '') or error_data.get('error', '') or resp.text
             
             # Check for scope errors
             if 'scope' in error_msg.lower():
-                return jsonify({
+                failure_payload = {
                     'authenticated': False,
                     'error': error_msg,
                     'token_source': token_source,
@@ -3247,17 +3882,22 @@ def verify_auth():
                            'If using Databricks App with user authorization, the user may need to '
                            're-authorize the app. Try: (1) Sign out and sign back in, or '
                            '(2) Use a Personal Access Token instead.',
-                }), 403
-            
-            return jsonify({
+                }
+                _cache_verify_failure(token, host, failure_payload, 403)
+                return jsonify(failure_payload), 403
+
+            failure_payload = {
                 'authenticated': False,
                 'error': error_msg,
                 'status_code': resp.status_code,
                 'token_source': token_source,
                 'host_source': host_source,
-            }), resp.status_code
+            }
+            if resp.status_code in (401, 403):
+                _cache_verify_failure(token, host, failure_payload, resp.status_code)
+            return jsonify(failure_payload), resp.status_code
             
-    except Exception as e:
+    except http_requests.exceptions.RequestException as e:
         return jsonify({
             'authenticated': False,
             'error': str(e),
@@ -3266,14 +3906,38 @@ def verify_auth():
         }), 500
 
 
+# Header-name prefixes surfaced by /api/debug; a single startswith against
+# this tuple replaces two lowercase+startswith calls per header.
+_DEBUG_HEADER_PREFIXES = ('x-forwarded', 'x-real')
+_DEBUG_SENSITIVE_MARKERS = ('token', 'secret')
+
+
+@lru_cache(maxsize=1)
+def _debug_environment_section() -> dict:
+    """
+    Snapshot of the Databricks-related environment shown by /api/debug.
+
+    Environment configuration is fixed at process start (deployment threads
+    only mutate it transiently), so this is computed once instead of probing
+    os.environ on every request.
+    """
+    return {
+        'DATABRICKS_HOST': os.environ.get('DATABRICKS_HOST', 'not set'),
+        'DATABRICKS_TOKEN': 'set' if os.environ.get('DATABRICKS_TOKEN') else 'not set',
+        'DATABRICKS_CLIENT_ID': 'set' if os.environ.get('DATABRICKS_CLIENT_ID') else 'not set',
+    }
+
+
 @app.route('/api/debug')
 def debug_info():
     """Debug endpoint to check headers and config."""
     # Get all forwarded headers (safe to show names, not values)
     forwarded_headers = {
-        k: ('***' if 'token' in k.lower() or 'secret' in k.lower() else v[:50] + '...' if len(str(v)) > 50 else v)
-        for k, v in request.headers 
-        if k.lower().startswith('x-forwarded') or k.lower().startswith('x-real')
+        k: ('***' if any(m in kl for m in _DEBUG_SENSITIVE_MARKERS)
+            else v[:50] + '...' if len(str(v)) > 50 else v)
+        for k, v in request.headers
+        for kl in (k.lower(),)
+        if kl.startswith(_DEBUG_HEADER_PREFIXES)
     }
     
     token, source = get_databricks_token_with_source()
@@ -3299,11 +3963,7 @@ def debug_info():
             'has_auth_header': bool(request.headers.get('Authorization')),
             'has_oauth_session': 'access_token' in session,
         },
-        'environment': {
-            'DATABRICKS_HOST': os.environ.get('DATABRICKS_HOST', 'not set'),
-            'DATABRICKS_TOKEN': 'set' if os.environ.get('DATABRICKS_TOKEN') else 'not set',
-            'DATABRICKS_CLIENT_ID': 'set' if os.environ.get('DATABRICKS_CLIENT_ID') else 'not set',
-        },
+        'environment': _debug_environment_section(),
         'configured_scopes': OAUTH_SCOPES,
     })
 
@@ -3312,10 +3972,139 @@ def debug_info():
 # Deployment APIs
 # =============================================================================
 
+# Resource keys that translate into deployment requirements, as
+# (resources key, requirement type, description) rows. validate_deployment
+# walks this table in one pass instead of re-probing the dict per type.
+_REQUIREMENT_SPECS = (
+    ('vector_stores', 'vector_search', 'Vector Search endpoints and indexes'),
+    ('genie_rooms', 'genie', 'Genie Rooms'),
+    ('databases', 'database', 'Lakebase/PostgreSQL databases'),
+    ('functions', 'functions', 'Unity Catalog functions'),
+)
+
+# Bounded worker pool for background deployments. Reuses threads across
+# deploys and caps concurrency instead of spawning an unbounded native thread
+# (with its own stack) per request.
+_deploy_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='deploy')
+
+# Serializes the span of run_deployment that mutates process-global env vars
+# (DATABRICKS_*, MLFLOW_TRACKING_TOKEN). Without it, two deployments using
+# different credentials overwrite and mis-restore each other's auth context.
+_env_mutation_lock = threading.Lock()
+
+
+def _apply_auth_env(updates: dict) -> None:
+    """Apply auth env vars, touching os.environ only on actual changes.
+
+    A value of None clears the variable. Consecutive requests from the same
+    user carry the same token/host, so the common case performs no mutation
+    at all - which also shrinks the window in which concurrent requests with
+    different credentials can observe each other's auth context.
+    """
+    for var, value in updates.items():
+        if value is None:
+            os.environ.pop(var, None)
+        elif os.environ.get(var) != value:
+            os.environ[var] = value
+
 # Track deployment status in memory (in production, use a database or distributed cache)
 _deployment_status = {}
-# Lock to protect status updates from race conditions between cancel endpoint and deployment thread
-_deployment_status_lock = threading.Lock()
+# Guards inserts/removes on the outer dict only. Each status entry carries its
+# own '_lock' so pollers and workers on unrelated deployments don't contend.
+_deployments_index_lock = threading.Lock()
+
+
+def _public_status(status: dict) -> dict:
+    """Copy a deployment status entry, dropping internal fields like locks.
+
+    Keys starting with '_' are synchronization primitives that must not be
+    serialized. 'steps' is a copy-on-write tuple (see _set_step) whose entries
+    are never mutated in place, so snapshots can share it without copying.
+    """
+    return {k: v for k, v in status.items() if not k.startswith('_')}
+
+
+@lru_cache(maxsize=1)
+def _ensure_spark_session_patch() -> bool:
+    """Patch DatabricksFunctionClient to skip Spark session creation, once.
+
+    The function client tries to start a Spark session via Databricks
+    Connect, which requires OAuth scopes that deployment tokens typically
+    don't have (Invalid scope error). The builder process never needs Spark,
+    so the patch is installed permanently on first deployment; the previous
+    per-deployment patch/restore pair raced under parallel deploys.
+    """
+    try:
+        from unitycatalog.ai.core.databricks import DatabricksFunctionClient
+    except ImportError:
+        log('warning', "Could not patch DatabricksFunctionClient - unitycatalog not found")
+        return False
+
+    def skip_spark_session(self):
+        log('info', "Skipping Spark session initialization for deployment")
+        self.spark = None
+
+    DatabricksFunctionClient.set_spark_session = skip_spark_session
+    log('info', "Patched DatabricksFunctionClient to skip Spark session")
+    return True
+
+
+# Validated AppConfig models keyed by config content hash. "Deploy again"
+# with an unchanged config is common, and full Pydantic validation of a large
+# config is a known hotspot; bounded so abandoned configs age out.
+_app_config_cache: OrderedDict[str, object] = OrderedDict()
+_app_config_cache_lock = threading.Lock()
+_APP_CONFIG_CACHE_MAX = 32
+
+
+def _load_app_config(config_path: str, config: dict):
+    """Load an AppConfig from file, memoized by the config's content.
+
+    Args:
+        config_path: Path of the temp YAML file written for this deployment.
+        config: The config dict the file was rendered from (used as cache key).
+    """
+    from dao_ai.config import AppConfig
+
+    key = hashlib.blake2b(_canonical_key(config), digest_size=16).hexdigest()
+    with _app_config_cache_lock:
+        cached = _app_config_cache.get(key)
+        if cached is not None:
+            _app_config_cache.move_to_end(key)
+            return cached
+
+    app_config = AppConfig.from_file(config_path)
+
+    with _app_config_cache_lock:
+        _app_config_cache[key] = app_config
+        while len(_app_config_cache) > _APP_CONFIG_CACHE_MAX:
+            _app_config_cache.popitem(last=False)
+    return app_config
+
+
+def _bump_version(status: dict) -> None:
+    """Bump the status version and wake any long-poll waiters.
+
+    The per-deployment condition wraps an RLock, so this is safe whether or
+    not the caller already holds it.
+    """
+    cond = status['_lock']
+    with cond:
+        status['version'] += 1
+        cond.notify_all()
+
+
+def _set_step(status: dict, index: int, **changes) -> None:
+    """Update one step entry copy-on-write.
+
+    Writers swap in a fresh tuple with a fresh dict for the changed step
+    instead of mutating in place, so pollers serializing an earlier snapshot
+    never observe a half-updated entry. Call with the deployment's '_lock'
+    held when the update must be atomic with other status fields.
+    """
+    steps = status['steps']
+    new_step = {**steps[index], **changes}
+    status['steps'] = steps[:index] + (new_step,) + steps[index + 1:]
 
 @app.route('/api/deploy/validate', methods=['POST'])
 def validate_deployment():
@@ -3327,16 +4116,12 @@ def validate_deployment():
     Returns validation results and deployment requirements.
     """
     try:
-        import yaml
-        import tempfile
-        import os as os_module
-        
-        data = request.get_json()
+        data = _get_request_json()
         config = data.get('config')
-        
+
         if not config:
             return jsonify({'error': 'config is required'}), 400
-        
+
         # Check required fields for deployment
         errors = []
         warnings = []
@@ -3389,34 +4174,15 @@ def validate_deployment():
             warnings.append('No models (LLM / embedding / judge) configured in resources')
         
         # Determine requirements based on configuration
-        if resources.get('vector_stores'):
-            requirements.append({
-                'type': 'vector_search',
-                'description': 'Vector Search endpoints and indexes',
-                'count': len(resources.get('vector_stores', {}))
-            })
-        
-        if resources.get('genie_rooms'):
-            requirements.append({
-                'type': 'genie',
-                'description': 'Genie Rooms',
-                'count': len(resources.get('genie_rooms', {}))
-            })
-        
-        if resources.get('databases'):
-            requirements.append({
-                'type': 'database',
-                'description': 'Lakebase/PostgreSQL databases',
-                'count': len(resources.get('databases', {}))
-            })
-        
-        if resources.get('functions'):
-            requirements.append({
-                'type': 'functions',
-                'description': 'Unity Catalog functions',
-                'count': len(resources.get('functions', {}))
-            })
-        
+        for resource_key, req_type, description in _REQUIREMENT_SPECS:
+            resource = resources.get(resource_key)
+            if resource:
+                requirements.append({
+                    'type': req_type,
+                    'description': description,
+                    'count': len(resource)
+                })
+
         is_valid = len(errors) == 0
         
         # Dynamic deployment options based on deployment target
@@ -3461,12 +4227,89 @@ def validate_deployment():
         })
         
     except Exception as e:
-        import traceback
         log('error', f"Error validating deployment: {e}")
         log('error', f"Traceback: {traceback.format_exc()}")
         return jsonify({'error': str(e)}), 500
 
 
+# fastjsonschema compiles a schema down to a plain Python function that is an
+# order of magnitude faster than jsonschema's interpreter. Optional, like the
+# other accelerators; jsonschema remains the fallback (and supplies the
+# detailed error walk, since fastjsonschema stops at the first failure).
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+_fast_schema_cache: dict = {}
+
+
+def _compiled_fast_validator(json_schema: dict):
+    """Return the fastjsonschema-compiled callable for this schema."""
+    schema_hash = hashlib.blake2b(_canonical_key(json_schema), digest_size=16).hexdigest()
+    with _schema_validator_cache_lock:
+        validate = _fast_schema_cache.get(schema_hash)
+        if validate is None:
+            validate = fastjsonschema.compile(json_schema)
+            _fast_schema_cache.clear()  # only ever one live schema version
+            _fast_schema_cache[schema_hash] = validate
+    return validate
+
+
+# Compiled JSON-schema validator cache for /api/validate/schema. Compiling a
+# Draft7Validator over the full AppConfig schema (hundreds of $defs) is
+# expensive; keyed by schema hash so a dao-ai upgrade that changes the schema
+# invalidates the entry naturally.
+_schema_validator_cache: dict = {}
+_schema_validator_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _get_app_config_json_schema() -> dict:
+    """Generate the JSON schema for dao-ai's AppConfig model, once.
+
+    Pydantic schema generation over the full AppConfig tree is a significant
+    per-call cost, and the schema only changes with a dao-ai upgrade (which
+    restarts the process). Failed calls are not cached by lru_cache, so a
+    transient import error doesn't poison the cache.
+    """
+    from dao_ai.config import AppConfig
+    return AppConfig.model_json_schema()
+
+# Validation results keyed by content hash: identical documents always
+# validate to the same payload for a given schema version.
+_validate_result_cache: OrderedDict[str, dict] = OrderedDict()
+_VALIDATE_RESULT_CACHE_MAX = 256
+
+# Full-line comments, stripped before parsing so commented-out template
+# sections don't reach the schema validator.
+_COMMENT_LINE_RE = re.compile(r'(?m)^[ \t]*#.*\n?')
+
+# Stop the jsonschema error walk once this many errors have been collected;
+# the editor only ever shows a handful.
+_MAX_SCHEMA_ERRORS = 50
+
+# Prefer LibYAML's C loader/dumper - several-fold faster than the pure-Python
+# implementations for realistically sized configs. Fall back when PyYAML was
+# built without libyaml support.
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+
+def _compiled_schema_validator(json_schema: dict, validator_cls):
+    """Return a compiled validator for the schema, reusing a cached instance."""
+    schema_hash = hashlib.blake2b(_canonical_key(json_schema), digest_size=16).hexdigest()
+    with _schema_validator_cache_lock:
+        validator = _schema_validator_cache.get(schema_hash)
+        if validator is None:
+            validator = validator_cls(json_schema)
+            _schema_validator_cache.clear()  # only ever one live schema version
+            _schema_validator_cache[schema_hash] = validator
+    return validator
+
+
 @app.route('/api/validate/schema', methods=['POST'])
 def validate_schema():
     """Validate YAML configuration against dao_ai.config.AppConfig JSON schema.
@@ -3480,134 +4323,34 @@ def validate_schema():
     
     Returns validation results with detailed error messages.
     """
-    import yaml as pyyaml
-    import json
-    
     try:
-        data = request.get_json()
+        data = _get_request_json()
         yaml_content = data.get('yaml_content')
-        
+
         if not yaml_content:
             return jsonify({'error': 'yaml_content is required'}), 400
-        
-        # Parse YAML first
-        try:
-            # Remove comment lines before parsing
-            clean_yaml = '\n'.join(
-                line for line in yaml_content.split('\n') 
-                if not line.strip().startswith('#')
-            )
-            config_dict = pyyaml.safe_load(clean_yaml)
-        except pyyaml.YAMLError as yaml_err:
-            log('warning', f"YAML parse error: {yaml_err}")
-            return jsonify({
-                'valid': False,
-                'errors': [{
-                    'path': '/',
-                    'message': f'YAML parse error: {str(yaml_err)}',
-                    'type': 'yaml_parse'
-                }]
-            })
-        
-        if not config_dict:
-            # Empty configuration is valid - user hasn't added anything yet
-            return jsonify({
-                'valid': True,
-                'errors': []
-            })
-        
-        # Check if this is an essentially empty/minimal config (work in progress)
-        # Don't show errors for configs that are just starting to be built
-        is_minimal = (
-            not config_dict.get('agents') and 
-            not config_dict.get('app') and 
-            not config_dict.get('tools')
-        )
-        
-        if is_minimal:
-            # Config is still being built - don't show validation errors
-            return jsonify({
-                'valid': True,
-                'errors': [],
-                'status': 'incomplete'
-            })
-        
-        # Try to import AppConfig and jsonschema
-        try:
-            from dao_ai.config import AppConfig
-            import jsonschema
-            from jsonschema import Draft7Validator, ValidationError as JsonSchemaValidationError
-        except ImportError as ie:
-            log('error', f"Failed to import validation libraries: {ie}")
-            # If we can't import the validation library, just return valid
-            # The actual deployment will catch any real errors
-            return jsonify({
-                'valid': True,
-                'errors': [],
-                'status': 'skipped',
-                'message': 'Schema validation skipped - validator not available'
-            })
-        
-        # Generate JSON schema from Pydantic model
-        # This gives us the schema without triggering any model validators
-        try:
-            json_schema = AppConfig.model_json_schema()
-            log('debug', f"Generated JSON schema with {len(json_schema.get('$defs', {}))} definitions")
-        except Exception as schema_err:
-            log('error', f"Failed to generate JSON schema: {schema_err}")
-            return jsonify({
-                'valid': True,
-                'errors': [],
-                'status': 'skipped',
-                'message': f'Schema generation failed: {str(schema_err)}'
-            })
-        
-        # Validate config against JSON schema
-        try:
-            # Create validator with format checking
-            validator = Draft7Validator(json_schema)
-            
-            # Collect all validation errors
-            errors = []
-            for error in validator.iter_errors(config_dict):
-                # Build path from error path
-                path_parts = list(error.absolute_path)
-                path = '/' + '/'.join(str(p) for p in path_parts) if path_parts else '/'
-                
-                errors.append({
-                    'path': path,
-                    'message': error.message,
-                    'type': error.validator,
-                    'schema_path': '/'.join(str(p) for p in error.schema_path)
-                })
-            
-            if errors:
-                log('info', f"JSON schema validation found {len(errors)} errors")
-                return jsonify({
-                    'valid': False,
-                    'errors': errors
-                })
-            
-            return jsonify({
-                'valid': True,
-                'errors': []
-            })
-            
-        except Exception as validation_err:
-            import traceback
-            log('error', f"JSON schema validation error: {validation_err}")
-            log('error', f"Traceback: {traceback.format_exc()}")
-            return jsonify({
-                'valid': False,
-                'errors': [{
-                    'path': '/',
-                    'message': f'Validation error: {str(validation_err)}',
-                    'type': 'validation_error'
-                }]
-            })
-        
+
+        # Identical documents validate identically and the editor re-submits
+        # unchanged content (tab switches, autosave), so results are served
+        # from a bounded content-hash cache when possible.
+        cache_key = hashlib.blake2b(yaml_content.encode(), digest_size=16).hexdigest()
+        with _schema_validator_cache_lock:
+            cached = _validate_result_cache.get(cache_key)
+            if cached is not None:
+                _validate_result_cache.move_to_end(cache_key)
+                return jsonify(cached)
+
+        result = _validate_schema_payload(yaml_content)
+
+        with _schema_validator_cache_lock:
+            _validate_result_cache[cache_key] = result
+            _validate_result_cache.move_to_end(cache_key)
+            while len(_validate_result_cache) > _VALIDATE_RESULT_CACHE_MAX:
+                _validate_result_cache.popitem(last=False)
+
+        return jsonify(result)
+
     except Exception as e:
-        import traceback
         log('error', f"Error validating schema: {e}")
         log('error', f"Traceback: {traceback.format_exc()}")
         # Return 200 with error details so frontend can display them
@@ -3622,31 +4365,170 @@ def validate_schema():
         })
 
 
-@app.route('/api/deploy/quick', methods=['POST'])
-def deploy_quick():
-    """Deploy model and endpoint only (quick deployment).
-    
-    This uses dao_ai's create_agent() and deploy_agent() methods.
-    
-    Request body:
-    - config: The YAML configuration as a dictionary
-    - credentials: Optional credential configuration
-        - type: 'app' | 'obo' | 'manual_sp' | 'manual_pat'
-        - client_id: Required for manual_sp
-        - client_secret: Required for manual_sp
+def _validate_schema_payload(yaml_content: str) -> dict:
+    """Validate a YAML document against the AppConfig schema.
+
+    Returns the response payload dict for /api/validate/schema; cacheable
+    because it depends only on the document content and the schema version.
+    """
+    # Parse YAML first
+    try:
+        # Remove comment lines before parsing
+        clean_yaml = _COMMENT_LINE_RE.sub('', yaml_content)
+        config_dict = yaml.load(clean_yaml, Loader=_YamlLoader)
+    except yaml.YAMLError as yaml_err:
+        log('warning', f"YAML parse error: {yaml_err}")
+        return {
+            'valid': False,
+            'errors': [{
+                'path': '/',
+                'message': f'YAML parse error: {str(yaml_err)}',
+                'type': 'yaml_parse'
+            }]
+        }
+
+    if not config_dict:
+        # Empty configuration is valid - user hasn't added anything yet
+        return {
+            'valid': True,
+            'errors': []
+        }
+
+    # Check if this is an essentially empty/minimal config (work in progress)
+    # Don't show errors for configs that are just starting to be built
+    is_minimal = (
+        not config_dict.get('agents') and
+        not config_dict.get('app') and
+        not config_dict.get('tools')
+    )
+
+    if is_minimal:
+        # Config is still being built - don't show validation errors
+        return {
+            'valid': True,
+            'errors': [],
+            'status': 'incomplete'
+        }
+
+    # Try to import jsonschema
+    try:
+        import jsonschema
+        from jsonschema import Draft7Validator, ValidationError as JsonSchemaValidationError
+    except ImportError as ie:
+        log('error', f"Failed to import validation libraries: {ie}")
+        # If we can't import the validation library, just return valid
+        # The actual deployment will catch any real errors
+        return {
+            'valid': True,
+            'errors': [],
+            'status': 'skipped',
+            'message': 'Schema validation skipped - validator not available'
+        }
+
+    # Get the JSON schema for the Pydantic model (generated once, then cached)
+    # This gives us the schema without triggering any model validators
+    try:
+        json_schema = _get_app_config_json_schema()
+        log('debug', f"Using JSON schema with {len(json_schema.get('$defs', {}))} definitions")
+    except ImportError as ie:
+        log('error', f"Failed to import validation libraries: {ie}")
+        return {
+            'valid': True,
+            'errors': [],
+            'status': 'skipped',
+            'message': 'Schema validation skipped - validator not available'
+        }
+    except Exception as schema_err:
+        log('error', f"Failed to generate JSON schema: {schema_err}")
+        return {
+            'valid': True,
+            'errors': [],
+            'status': 'skipped',
+            'message': f'Schema generation failed: {str(schema_err)}'
+        }
+
+    # Fast path: validate with the compiled fastjsonschema function when
+    # available. The common case (a valid config) returns here without
+    # touching jsonschema's much slower interpreter.
+    if fastjsonschema is not None:
+        try:
+            fast_validate = _compiled_fast_validator(json_schema)
+            fast_validate(config_dict)
+            return {
+                'valid': True,
+                'errors': []
+            }
+        except fastjsonschema.JsonSchemaValueException:
+            pass  # invalid - fall through for the detailed error list
+        except Exception as fast_err:
+            log('warning', f"fastjsonschema validation unavailable: {fast_err}")
+
+    # Validate config against JSON schema
+    try:
+        # Create (or reuse) the compiled validator for this schema
+        validator = _compiled_schema_validator(json_schema, Draft7Validator)
+
+        # Collect validation errors, capped - the editor only displays a
+        # handful, so don't walk a pathological document to completion
+        errors = []
+        for error in itertools.islice(validator.iter_errors(config_dict), _MAX_SCHEMA_ERRORS):
+            # Build path from error path
+            path_parts = list(error.absolute_path)
+            path = '/' + '/'.join(str(p) for p in path_parts) if path_parts else '/'
+
+            errors.append({
+                'path': path,
+                'message': error.message,
+                'type': error.validator,
+                'schema_path': '/'.join(str(p) for p in error.schema_path)
+            })
+
+        if errors:
+            log('info', f"JSON schema validation found {len(errors)} errors")
+            result = {
+                'valid': False,
+                'errors': errors
+            }
+            if len(errors) == _MAX_SCHEMA_ERRORS:
+                result['truncated'] = True
+            return result
+
+        return {
+            'valid': True,
+            'errors': []
+        }
+
+    except Exception as validation_err:
+        log('error', f"JSON schema validation error: {validation_err}")
+        log('error', f"Traceback: {traceback.format_exc()}")
+        return {
+            'valid': False,
+            'errors': [{
+                'path': '/',
+                'message': f'Validation error: {str(validation_err)}',
+                'type': 'validation_error'
+            }]
+        }
+
+
+@app.route('/api/deploy/quick', methods=['POST'])
+def deploy_quick():
+    """Deploy model and endpoint only (quick deployment).
+    
+    This uses dao_ai's create_agent() and deploy_agent() methods.
+    
+    Request body:
+    - config: The YAML configuration as a dictionary
+    - credentials: Optional credential configuration
+        - type: 'app' | 'obo' | 'manual_sp' | 'manual_pat'
+        - client_id: Required for manual_sp
+        - client_secret: Required for manual_sp
         - pat: Required for manual_pat
     
     Returns deployment job ID and status.
     """
     try:
-        import yaml
-        import tempfile
-        import os as os_module
-        import threading
-        import uuid
-        from datetime import datetime
-        
-        data = request.get_json()
+        data = _get_request_json()
         config = data.get('config')
         credentials = data.get('credentials', {})
         target_str = data.get('target', 'model_serving')  # Default to model_serving
@@ -3730,20 +4612,24 @@ def deploy_quick():
             }), 400
         
         # Initialize status
-        _deployment_status[deployment_id] = {
-            'id': deployment_id,
-            'status': 'starting',
-            'type': 'quick',
-            'started_at': datetime.now().isoformat(),
-            'steps': [
-                {'name': 'validate', 'status': 'pending'},
-                {'name': 'create_agent', 'status': 'pending'},
-                {'name': 'deploy_agent', 'status': 'pending'},
-            ],
-            'current_step': 0,
-            'error': None,
-            'result': None
-        }
+        with _deployments_index_lock:
+            _deployment_status[deployment_id] = {
+                'id': deployment_id,
+                'status': 'starting',
+                'type': 'quick',
+                'started_at': datetime.now().isoformat(),
+                'steps': (
+                    {'name': 'validate', 'status': 'pending'},
+                    {'name': 'create_agent', 'status': 'pending'},
+                    {'name': 'deploy_agent', 'status': 'pending'},
+                ),
+                'current_step': 0,
+                'error': None,
+                'result': None,
+                'version': 0,
+                '_lock': threading.Condition(),
+                '_cancel_event': threading.Event(),
+            }
         
         def run_deployment(deployment_id: str, config: dict, auth_token: str | None, 
                           auth_host: str, sp_client_id: str | None, sp_client_secret: str | None,
@@ -3752,192 +4638,179 @@ def deploy_quick():
             """Run deployment in background thread."""
             try:
                 status = _deployment_status[deployment_id]
-                
+                # Event reads are atomic, so cancellation checks don't need the lock
+                cancel_event = status['_cancel_event']
+
                 # Step 1: Validate and load config
-                status['steps'][0]['status'] = 'running'
+                _set_step(status, 0, status='running')
                 status['current_step'] = 0
+                _bump_version(status)
                 
                 # Write config to temp file
                 with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-                    yaml.dump(config, f)
+                    yaml.dump(config, f, Dumper=_YamlDumper)
                     config_path = f.name
                 
-                # Save original env vars to restore later
-                orig_env = {
-                    'DATABRICKS_HOST': os_module.environ.get('DATABRICKS_HOST'),
-                    'DATABRICKS_TOKEN': os_module.environ.get('DATABRICKS_TOKEN'),
-                    'DATABRICKS_CLIENT_ID': os_module.environ.get('DATABRICKS_CLIENT_ID'),
-                    'DATABRICKS_CLIENT_SECRET': os_module.environ.get('DATABRICKS_CLIENT_SECRET'),
-                    'MLFLOW_TRACKING_TOKEN': os_module.environ.get('MLFLOW_TRACKING_TOKEN'),
-                }
+                # The deployment libraries read credentials from process-global
+                # env vars, so parallel deployments with different auth would
+                # corrupt each other's context. Serialize the env-mutating span.
+                with _env_mutation_lock:
+                    # Save original env vars to restore later
+                    orig_env = {
+                        'DATABRICKS_HOST': os.environ.get('DATABRICKS_HOST'),
+                        'DATABRICKS_TOKEN': os.environ.get('DATABRICKS_TOKEN'),
+                        'DATABRICKS_CLIENT_ID': os.environ.get('DATABRICKS_CLIENT_ID'),
+                        'DATABRICKS_CLIENT_SECRET': os.environ.get('DATABRICKS_CLIENT_SECRET'),
+                        'MLFLOW_TRACKING_TOKEN': os.environ.get('MLFLOW_TRACKING_TOKEN'),
+                    }
                 
-                try:
-                    # Import dao_ai, databricks SDK, and mlflow
-                    from dao_ai.config import AppConfig
-                    import mlflow
-                    
-                    # Load config first to access environment_vars
-                    app_config = AppConfig.from_file(config_path)
+                    try:
+                        # Import dao_ai, databricks SDK, and mlflow
+                        import mlflow
+
+                        # Load config first to access environment_vars (memoized
+                        # by content so retries skip re-validation)
+                        app_config = _load_app_config(config_path, config)
                     
-                    # Set environment variables for VectorSearchClient and other SDK clients
-                    # These are needed because when MLflow validates the model by loading agent_as_code.py,
-                    # it creates VectorSearchClient which reads from environment variables
-                    log('info', f"Setting up environment for {'PAT token' if auth_token else 'service principal'} auth")
+                        # Set environment variables for VectorSearchClient and other SDK clients
+                        # These are needed because when MLflow validates the model by loading agent_as_code.py,
+                        # it creates VectorSearchClient which reads from environment variables
+                        log('info', f"Setting up environment for {'PAT token' if auth_token else 'service principal'} auth")
                     
-                    # Clear any conflicting auth methods first
-                    for var in ['DATABRICKS_TOKEN', 'DATABRICKS_CLIENT_ID', 'DATABRICKS_CLIENT_SECRET', 'MLFLOW_TRACKING_TOKEN']:
-                        if var in os_module.environ:
-                            del os_module.environ[var]
+                        # Clear any conflicting auth methods first
+                        for var in ['DATABRICKS_TOKEN', 'DATABRICKS_CLIENT_ID', 'DATABRICKS_CLIENT_SECRET', 'MLFLOW_TRACKING_TOKEN']:
+                            if var in os.environ:
+                                del os.environ[var]
                     
-                    # Set the host (ensure https:// scheme)
-                    os_module.environ['DATABRICKS_HOST'] = normalize_host(auth_host)
+                        # Set the host (ensure https:// scheme)
+                        os.environ['DATABRICKS_HOST'] = normalize_host(auth_host)
                     
-                    # Set the authentication method
-                    if auth_token:
-                        os_module.environ['DATABRICKS_TOKEN'] = auth_token
-                        # Also set MLFLOW_TRACKING_TOKEN for MLflow to use
-                        os_module.environ['MLFLOW_TRACKING_TOKEN'] = auth_token
-                        log('info', "Using PAT token authentication")
-                    elif sp_client_id and sp_client_secret:
-                        os_module.environ['DATABRICKS_CLIENT_ID'] = sp_client_id
-                        os_module.environ['DATABRICKS_CLIENT_SECRET'] = sp_client_secret
-                        log('info', "Using service principal authentication")
+                        # Set the authentication method
+                        if auth_token:
+                            os.environ['DATABRICKS_TOKEN'] = auth_token
+                            # Also set MLFLOW_TRACKING_TOKEN for MLflow to use
+                            os.environ['MLFLOW_TRACKING_TOKEN'] = auth_token
+                            log('info', "Using PAT token authentication")
+                        elif sp_client_id and sp_client_secret:
+                            os.environ['DATABRICKS_CLIENT_ID'] = sp_client_id
+                            os.environ['DATABRICKS_CLIENT_SECRET'] = sp_client_secret
+                            log('info', "Using service principal authentication")
                     
-                    # Set MLflow tracking URI to Databricks
-                    # MLflow will use DATABRICKS_HOST and DATABRICKS_TOKEN env vars for authentication
-                    mlflow.set_tracking_uri("databricks")
-                    mlflow.set_registry_uri("databricks-uc")
-                    log('info', f"Set MLflow tracking URI to 'databricks' with host: {auth_host}")
+                        # Set MLflow tracking URI to Databricks
+                        # MLflow will use DATABRICKS_HOST and DATABRICKS_TOKEN env vars for authentication
+                        mlflow.set_tracking_uri("databricks")
+                        mlflow.set_registry_uri("databricks-uc")
+                        log('info', f"Set MLflow tracking URI to 'databricks' with host: {auth_host}")
                     
-                    # Set any environment_vars from the config
-                    # SKIP variables that use {{secrets/...}} syntax - these are only resolved
-                    # by Databricks Model Serving at runtime, not during local agent creation.
-                    # Setting them would override the fallback mechanism in database configs.
-                    if app_config.app and app_config.app.environment_vars:
-                        log('info', f"Processing {len(app_config.app.environment_vars)} environment variables from config")
-                        for key, value in app_config.app.environment_vars.items():
-                            if value is not None:
-                                str_value = str(value)
-                                # Skip Model Serving secret references - they only work at runtime
-                                if '{{secrets/' in str_value:
-                                    log('info', f"Skipping {key} - contains Model Serving secret reference (will be resolved at runtime)")
-                                    continue
-                                # Save original value for restoration
-                                if key not in orig_env:
-                                    orig_env[key] = os_module.environ.get(key)
-                                os_module.environ[key] = str_value
-                                log('info', f"Set environment variable: {key}")
+                        # Set any environment_vars from the config
+                        # SKIP variables that use {{secrets/...}} syntax - these are only resolved
+                        # by Databricks Model Serving at runtime, not during local agent creation.
+                        # Setting them would override the fallback mechanism in database configs.
+                        if app_config.app and app_config.app.environment_vars:
+                            log('info', f"Processing {len(app_config.app.environment_vars)} environment variables from config")
+                            for key, value in app_config.app.environment_vars.items():
+                                if value is not None:
+                                    str_value = str(value)
+                                    # Skip Model Serving secret references - they only work at runtime
+                                    if '{{secrets/' in str_value:
+                                        log('info', f"Skipping {key} - contains Model Serving secret reference (will be resolved at runtime)")
+                                        continue
+                                    # Save original value for restoration
+                                    if key not in orig_env:
+                                        orig_env[key] = os.environ.get(key)
+                                    os.environ[key] = str_value
+                                    log('info', f"Set environment variable: {key}")
                     
-                    status['steps'][0]['status'] = 'completed'
+                        _set_step(status, 0, status='completed')
+                        _bump_version(status)
                     
-                    # Step 2: Create agent (or skip if requested for Apps deployment)
-                    # Pass credentials directly to create_agent - the updated dao_ai library
-                    # now supports passing pat/client_id/client_secret/workspace_host directly
-                    # Use lock to atomically check cancelled flag and update status
-                    with _deployment_status_lock:
-                        if status.get('cancelled'):
+                        # Step 2: Create agent (or skip if requested for Apps deployment)
+                        # Pass credentials directly to create_agent - the updated dao_ai library
+                        # now supports passing pat/client_id/client_secret/workspace_host directly
+                        if cancel_event.is_set():
                             log('info', f"Deployment {deployment_id} cancelled before agent creation")
                             # Status already set to 'cancelled' by cancel endpoint
                             return
-                        
-                        # Check if we should skip model creation (only allowed for Apps deployment)
-                        if skip_model_creation and deployment_target == 'apps':
-                            log('info', f"Skipping model creation for Apps deployment (skip_model_creation=True)")
-                            status['steps'][1]['status'] = 'skipped'
-                            status['current_step'] = 1
-                            status['status'] = 'skipping_model_creation'
-                        else:
-                            status['steps'][1]['status'] = 'running'
-                            status['current_step'] = 1
-                            status['status'] = 'creating_agent'
+                        with status['_lock']:
+                            # Check if we should skip model creation (only allowed for Apps deployment)
+                            if skip_model_creation and deployment_target == 'apps':
+                                log('info', f"Skipping model creation for Apps deployment (skip_model_creation=True)")
+                                _set_step(status, 1, status='skipped')
+                                status['current_step'] = 1
+                                status['status'] = 'skipping_model_creation'
+                            else:
+                                _set_step(status, 1, status='running')
+                                status['current_step'] = 1
+                                status['status'] = 'creating_agent'
+                            _bump_version(status)
                     
-                    # Only run model creation if not skipped
-                    if not (skip_model_creation and deployment_target == 'apps'):
-                        # Monkey-patch DatabricksFunctionClient to skip Spark session initialization
-                        # This is needed because the function client tries to create a Spark session
-                        # via Databricks Connect, which requires OAuth scopes that deployment tokens
-                        # typically don't have (Invalid scope error)
-                        original_set_spark = None
-                        try:
-                            from unitycatalog.ai.core.databricks import DatabricksFunctionClient
-                            original_set_spark = DatabricksFunctionClient.set_spark_session
-                            def skip_spark_session(self):
-                                log('info', "Skipping Spark session initialization for deployment")
-                                self.spark = None
-                            DatabricksFunctionClient.set_spark_session = skip_spark_session
-                            log('info', "Patched DatabricksFunctionClient to skip Spark session")
-                        except ImportError:
-                            log('warning', "Could not patch DatabricksFunctionClient - unitycatalog not found")
-                        
-                        log('info', f"Creating agent with {'PAT token' if auth_token else 'service principal'} auth for host: {auth_host}")
-                        try:
+                        # Only run model creation if not skipped
+                        if not (skip_model_creation and deployment_target == 'apps'):
+                            # DatabricksFunctionClient stays patched process-wide
+                            # to skip Spark sessions (see _ensure_spark_session_patch)
+                            _ensure_spark_session_patch()
+
+                            log('info', f"Creating agent with {'PAT token' if auth_token else 'service principal'} auth for host: {auth_host}")
                             app_config.create_agent(
                                 pat=auth_token,
                                 client_id=sp_client_id,
                                 client_secret=sp_client_secret,
                                 workspace_host=auth_host,
                             )
-                        finally:
-                            # Restore original method
-                            if original_set_spark:
-                                DatabricksFunctionClient.set_spark_session = original_set_spark
-                                log('info', "Restored DatabricksFunctionClient.set_spark_session")
-                    # Step 3: Deploy agent
-                    # Use lock to atomically check cancelled flag and update status
-                    with _deployment_status_lock:
-                        if status.get('cancelled'):
+                        # Step 3: Deploy agent
+                        if cancel_event.is_set():
                             log('info', f"Deployment {deployment_id} cancelled before deployment")
                             # Status already set to 'cancelled' by cancel endpoint
                             return
-                        # Mark step 1 as completed (if not skipped) and start step 2
-                        if status['steps'][1]['status'] != 'skipped':
-                            status['steps'][1]['status'] = 'completed'
-                        status['steps'][2]['status'] = 'running'
-                        status['current_step'] = 2
-                        status['status'] = 'deploying'
+                        with status['_lock']:
+                            # Mark step 1 as completed (if not skipped) and start step 2
+                            if status['steps'][1]['status'] != 'skipped':
+                                _set_step(status, 1, status='completed')
+                            _set_step(status, 2, status='running')
+                            status['current_step'] = 2
+                            status['status'] = 'deploying'
+                            _bump_version(status)
                     
-                    # Import DeploymentTarget enum
-                    from dao_ai.config import DeploymentTarget
-                    target = DeploymentTarget(deployment_target)
+                        # Import DeploymentTarget enum
+                        from dao_ai.config import DeploymentTarget
+                        target = DeploymentTarget(deployment_target)
                     
-                    log('info', f"Deploying agent with {'PAT token' if auth_token else 'service principal'} auth for host: {auth_host}, target: {deployment_target}")
-                    app_config.deploy_agent(
-                        target=target,
-                        pat=auth_token,
-                        client_id=sp_client_id,
-                        client_secret=sp_client_secret,
-                        workspace_host=auth_host,
-                    )
-                    # Check for cancellation - even if step completed, respect cancellation request
-                    # Use lock to ensure consistent state
-                    with _deployment_status_lock:
-                        if status.get('cancelled'):
+                        log('info', f"Deploying agent with {'PAT token' if auth_token else 'service principal'} auth for host: {auth_host}, target: {deployment_target}")
+                        app_config.deploy_agent(
+                            target=target,
+                            pat=auth_token,
+                            client_id=sp_client_id,
+                            client_secret=sp_client_secret,
+                            workspace_host=auth_host,
+                        )
+                        # Check for cancellation - even if step completed, respect cancellation request
+                        if cancel_event.is_set():
                             log('info', f"Deployment {deployment_id} cancelled during/after deployment")
                             # Status already set to 'cancelled' by cancel endpoint
                             return
-                        
-                        status['steps'][2]['status'] = 'completed'
-                        status['status'] = 'completed'
-                        status['completed_at'] = datetime.now().isoformat()
-                        status['result'] = {
-                            'endpoint_name': app_config.app.endpoint_name or app_config.app.name,
-                            'model_name': app_config.app.registered_model.full_name if app_config.app.registered_model else None,
-                            'message': 'Deployment completed successfully'
-                        }
+                        with status['_lock']:
+                            _set_step(status, 2, status='completed')
+                            status['status'] = 'completed'
+                            status['completed_at'] = datetime.now().isoformat()
+                            status['result'] = {
+                                'endpoint_name': app_config.app.endpoint_name or app_config.app.name,
+                                'model_name': app_config.app.registered_model.full_name if app_config.app.registered_model else None,
+                                'message': 'Deployment completed successfully'
+                            }
+                            _bump_version(status)
                     
-                finally:
-                    # Restore original env vars
-                    for var, value in orig_env.items():
-                        if value is not None:
-                            os_module.environ[var] = value
-                        elif var in os_module.environ:
-                            del os_module.environ[var]
+                    finally:
+                        # Restore original env vars
+                        for var, value in orig_env.items():
+                            if value is not None:
+                                os.environ[var] = value
+                            elif var in os.environ:
+                                del os.environ[var]
                     
-                    # Cleanup temp file
-                    os_module.unlink(config_path)
+                        # Cleanup temp file
+                        os.unlink(config_path)
                     
             except Exception as e:
-                import traceback
                 error_msg = str(e)
                 error_trace = traceback.format_exc()
                 log('error', f"Deployment {deployment_id} failed: {error_msg}")
@@ -3953,16 +4826,18 @@ def deploy_quick():
                 if 'steps' in status and 'current_step' in status:
                     current = status['current_step']
                     if current < len(status['steps']):
-                        status['steps'][current]['status'] = 'failed'
-                        status['steps'][current]['error'] = error_msg
-        
-        # Start deployment in background with auth credentials
-        thread = threading.Thread(
-            target=run_deployment, 
-            args=(deployment_id, config, token, host, client_id, client_secret, target_str, skip_model_creation)
+                        _set_step(status, current, status='failed', error=error_msg)
+                if '_lock' in status:
+                    _bump_version(status)
+        
+        # Start deployment on the bounded worker pool with auth credentials
+        future = _deploy_pool.submit(
+            run_deployment,
+            deployment_id, config, token, host, client_id, client_secret,
+            target_str, skip_model_creation
         )
-        thread.daemon = True
-        thread.start()
+        # Keep the future so cancel can drop queued-but-not-started jobs
+        _deployment_status[deployment_id]['_future'] = future
         
         return jsonify({
             'deployment_id': deployment_id,
@@ -3972,7 +4847,6 @@ def deploy_quick():
         })
         
     except Exception as e:
-        import traceback
         log('error', f"Error starting deployment: {e}")
         log('error', f"Traceback: {traceback.format_exc()}")
         return jsonify({'error': str(e)}), 500
@@ -3981,23 +4855,48 @@ def deploy_quick():
 @app.route('/api/deploy/status/<deployment_id>')
 def get_deployment_status(deployment_id: str):
     """Get deployment status.
-    
+
     Returns the current status of a deployment job.
-    Uses a lock to ensure we get a consistent snapshot of the status.
+    Reads optimistically: individual key reads are atomic under the GIL and
+    'steps' is an immutable snapshot, so no lock is needed unless a writer
+    bumps the version counter mid-copy.
     """
     status = _deployment_status.get(deployment_id)
-    
+
     if not status:
         return jsonify({'error': 'Deployment not found'}), 404
-    
-    # Take a snapshot under lock to avoid reading partially updated status
-    with _deployment_status_lock:
-        status_copy = dict(status)
-        # Deep copy steps to avoid issues with nested list
-        if 'steps' in status_copy:
-            status_copy['steps'] = [dict(step) for step in status_copy['steps']]
-    
-    return jsonify(status_copy)
+
+    # Long-poll support: ?wait=<seconds>&version=<last seen> blocks until the
+    # status moves past the caller's version (or the wait times out), so the
+    # frontend doesn't have to hammer the endpoint on a fixed interval.
+    wait_s = request.args.get('wait', type=float)
+    if wait_s:
+        wait_s = min(wait_s, 30.0)
+        baseline = request.args.get('version', type=int)
+        cond = status['_lock']
+        with cond:
+            if baseline is not None and status.get('version') == baseline:
+                cond.wait_for(lambda: status.get('version') != baseline, timeout=wait_s)
+            return fast_jsonify(_public_status(status))
+
+    version = status.get('version')
+
+    # Reuse the last snapshot while the version is unchanged: storing the
+    # (version, payload) tuple is a single atomic pointer swap, so repeat
+    # pollers between transitions get a zero-copy read.
+    snapshot = status.get('_snapshot')
+    if snapshot is not None and snapshot[0] == version:
+        return fast_jsonify(snapshot[1])
+
+    status_copy = _public_status(status)
+    if status.get('version') != version:
+        # A writer raced the copy - retry once under the deployment's lock
+        with status['_lock']:
+            status_copy = _public_status(status)
+    else:
+        status['_snapshot'] = (version, status_copy)
+
+    return fast_jsonify(status_copy)
 
 
 @app.route('/api/deploy/list')
@@ -4007,10 +4906,12 @@ def list_deployments():
     Returns a list of all deployment jobs with their status.
     """
     # Return deployments sorted by start time (newest first)
-    deployments = list(_deployment_status.values())
+    with _deployments_index_lock:
+        entries = list(_deployment_status.values())
+    deployments = [_public_status(entry) for entry in entries]
     deployments.sort(key=lambda x: x.get('started_at', ''), reverse=True)
-    
-    return jsonify({
+
+    return fast_jsonify({
         'deployments': deployments,
         'count': len(deployments)
     })
@@ -4031,8 +4932,8 @@ def cancel_deployment(deployment_id: str):
         log('warning', f"Cancel failed: deployment {deployment_id} not found")
         return jsonify({'error': 'Deployment not found'}), 404
     
-    # Use lock to prevent race condition with deployment thread
-    with _deployment_status_lock:
+    # Use this deployment's lock to prevent races with its worker thread
+    with status['_lock']:
         # Re-check status under lock
         current_status = status['status']
         log('info', f"Current status before cancel: {current_status}")
@@ -4045,20 +4946,25 @@ def cancel_deployment(deployment_id: str):
                 'message': f"Deployment is {current_status}"
             }), 400
         
-        # Set cancelled flag atomically with status update
+        # Signal the worker thread; event reads on its side are lock-free
+        status['_cancel_event'].set()
+        # If the job is still queued in the pool, drop it before it starts
+        future = status.get('_future')
+        if future is not None:
+            future.cancel()
         status['cancelled'] = True
         status['status'] = 'cancelled'
         status['completed_at'] = datetime.now().isoformat()
+        _bump_version(status)
         
         # Mark current step as failed with cancellation message
         if 'steps' in status and 'current_step' in status:
             current = status['current_step']
             if current < len(status['steps']):
-                status['steps'][current]['status'] = 'failed'
-                status['steps'][current]['error'] = 'Cancelled by user'
+                _set_step(status, current, status='failed', error='Cancelled by user')
         
         # Return a copy of status to avoid concurrent modification during serialization
-        status_copy = dict(status)
+        status_copy = _public_status(status)
     
     log('info', f"Deployment {deployment_id} cancelled successfully. Status is now: {status_copy['status']}")
     
@@ -4073,6 +4979,66 @@ def cancel_deployment(deployment_id: str):
 # Local Chat with Agent
 # =============================================================================
 
+# Emit an SSE comment frame after this many seconds without an agent event,
+# so intermediary proxies don't drop a stalled-but-alive stream.
+_SSE_KEEPALIVE_SECONDS = 15.0
+
+# Sentinel marking the end of a pumped agent event stream.
+_STREAM_DONE = object()
+
+# Stream debug-level log frames to the browser only when explicitly enabled;
+# each frame is an extra SSE payload on the wire.
+_DEBUG_STREAM = os.environ.get('DEBUG_STREAM', 'false').lower() == 'true'
+
+# Precomputed frame pieces for the per-token delta event, the one SSE payload
+# emitted thousands of times per chat: only the content string itself gets
+# serialized per token.
+_SSE_DELTA_PREFIX = b'data: {"type":"delta","content":'
+_SSE_SUFFIX = b'}\n\n'
+
+# Chat message role -> ResponsesAgent input item builder. Dispatching through
+# this table keeps the per-message conversion to a single dict build.
+_ROLE_WRAP = {
+    'user': lambda text: {
+        'type': 'message',
+        'role': 'user',
+        'content': [{'type': 'input_text', 'text': text}],
+    },
+    'assistant': lambda text: {
+        'type': 'message',
+        'role': 'assistant',
+        'content': [{'type': 'output_text', 'text': text}],
+    },
+}
+
+# Worker pool that drains blocking agent calls for SSE chats. Bounded and
+# reused so a burst of chats doesn't spawn a native thread per stream.
+_CHAT_PUMP_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix='chat-pump')
+
+# Built ResponsesAgents keyed by (config, auth identity) hash. Building the
+# agent compiles the LangGraph, constructs LLM clients, and loads tools -
+# the dominant cost of a short chat - while repeat chats against the same
+# config are the norm. Auth is part of the key so one user's agent (built
+# with their token in env) is never served to another.
+_agent_cache: OrderedDict = OrderedDict()
+_agent_cache_lock = threading.Lock()
+_AGENT_CACHE_MAX = 32
+
+
+@lru_cache(maxsize=1)
+def _chat_components():
+    """Resolve the dao-ai / MLflow classes the chat endpoint needs, once.
+
+    Lazy so startup and non-chat endpoints don't pay the heavy mlflow/dao_ai
+    import chain; cached so the request path resolves them a single time per
+    process instead of re-running import statements per chat.
+    """
+    from dao_ai.config import AppConfig
+    from mlflow.pyfunc import ResponsesAgent
+    from mlflow.types.responses import ResponsesAgentRequest
+    return AppConfig, ResponsesAgent, ResponsesAgentRequest
+
+
 @app.route('/api/chat', methods=['POST'])
 def chat_with_agent():
     """Chat locally with the configured agent using streaming.
@@ -4088,9 +5054,7 @@ def chat_with_agent():
     Returns:
     - SSE stream with events: log, delta, done, error
     """
-    import json as json_module
-    
-    data = request.get_json()
+    data = _get_request_json()
     config_dict = data.get('config')
     messages = data.get('messages', [])
     context = data.get('context', {})
@@ -4124,22 +5088,28 @@ def chat_with_agent():
         def send_log(level: str, message: str):
             """Send a log event"""
             log(level, message)  # Also log to server
-            yield f"data: {json_module.dumps({'type': 'log', 'level': level, 'message': message})}\n\n"
-        
+            if level == 'debug' and not _DEBUG_STREAM:
+                return
+            yield _sse_event({'type': 'log', 'level': level, 'message': message})
+
         def send_delta(content: str):
             """Send a text delta event"""
-            yield f"data: {json_module.dumps({'type': 'delta', 'content': content})}\n\n"
-        
+            if orjson is not None:
+                # prefix + escaped string + suffix: no dict build per token
+                yield _SSE_DELTA_PREFIX + orjson.dumps(content) + _SSE_SUFFIX
+            else:
+                yield _sse_event({'type': 'delta', 'content': content})
+
         def send_done(full_response: str):
             """Send completion event"""
-            yield f"data: {json_module.dumps({'type': 'done', 'response': full_response})}\n\n"
-        
+            yield _sse_event({'type': 'done', 'response': full_response})
+
         def send_error(error: str, trace: str = None):
             """Send error event"""
             data = {'type': 'error', 'error': error}
             if trace:
                 data['trace'] = trace
-            yield f"data: {json_module.dumps(data)}\n\n"
+            yield _sse_event(data)
         
         try:
             if not config_dict:
@@ -4152,91 +5122,116 @@ def chat_with_agent():
             
             yield from send_log('info', f"Chat request received with {len(messages)} messages")
             
-            # Set up authentication - use captured auth info from request context
-            # IMPORTANT: Clear ALL auth env vars first to avoid conflicts
-            for var in ['DATABRICKS_TOKEN', 'DATABRICKS_CLIENT_ID', 'DATABRICKS_CLIENT_SECRET', 'MLFLOW_TRACKING_TOKEN']:
-                if var in os.environ:
-                    del os.environ[var]
-            
+            # Set up authentication - use captured auth info from request context.
+            # Build the desired env state, then apply it idempotently: stale
+            # auth methods are cleared, unchanged values are left untouched.
+            env_updates = {
+                'DATABRICKS_TOKEN': None,
+                'DATABRICKS_CLIENT_ID': None,
+                'DATABRICKS_CLIENT_SECRET': None,
+                'MLFLOW_TRACKING_TOKEN': None,
+            }
+
             if auth_token_source == 'manual_sp':
                 yield from send_log('info', 'Using manual service principal authentication')
-                os.environ['DATABRICKS_CLIENT_ID'] = auth_client_id
-                os.environ['DATABRICKS_CLIENT_SECRET'] = auth_client_secret
+                env_updates['DATABRICKS_CLIENT_ID'] = auth_client_id
+                env_updates['DATABRICKS_CLIENT_SECRET'] = auth_client_secret
             elif auth_token:
                 yield from send_log('info', f"Using {auth_token_source} authentication")
-                os.environ['DATABRICKS_TOKEN'] = auth_token
-                os.environ['MLFLOW_TRACKING_TOKEN'] = auth_token
+                env_updates['DATABRICKS_TOKEN'] = auth_token
+                env_updates['MLFLOW_TRACKING_TOKEN'] = auth_token
             else:
                 yield from send_log('warning', 'No authentication token available - some features may not work')
-            
+
             if auth_host:
                 yield from send_log('debug', f"Using Databricks host from {auth_host_source}: {auth_host[:30]}...")
-                os.environ['DATABRICKS_HOST'] = normalize_host(auth_host)
-            
-            # Import dao-ai components
+                env_updates['DATABRICKS_HOST'] = normalize_host(auth_host)
+
+            # Resolve dao-ai components (imported once per process, cached)
             try:
-                from dao_ai.config import AppConfig
-                from mlflow.pyfunc import ResponsesAgent
+                AppConfig, ResponsesAgent, ResponsesAgentRequest = _chat_components()
                 yield from send_log('debug', 'Imported dao-ai and mlflow components')
             except ImportError as e:
                 yield from send_error(f'dao-ai library not available: {e}')
                 return
             
-            # Create AppConfig from the configuration
-            try:
-                app_config = AppConfig(**config_dict)
-                yield from send_log('info', f"Created AppConfig for app: {app_config.app.name}")
-                
-                # Log agent details
-                agent_names = list(config_dict.get('agents', {}).keys())
-                yield from send_log('debug', f"Agents: {', '.join(agent_names)}")
-                
-                # Log orchestration type
-                orch = config_dict.get('app', {}).get('orchestration', {})
-                if orch.get('supervisor'):
-                    yield from send_log('debug', f"Orchestration: Supervisor ({orch['supervisor'].get('name', 'unnamed')})")
-                elif orch.get('swarm'):
-                    yield from send_log('debug', f"Orchestration: Swarm ({orch['swarm'].get('name', 'unnamed')})")
-                elif orch.get('deep_agent'):
-                    yield from send_log('debug', f"Orchestration: Deep Agent ({orch['deep_agent'].get('name', 'unnamed')})")
-            except Exception as e:
-                import traceback
-                yield from send_error(f'Invalid configuration: {str(e)}', traceback.format_exc())
-                return
-            
-            # Create the ResponsesAgent
-            try:
-                yield from send_log('info', 'Creating LangGraph from configuration...')
-                agent: ResponsesAgent = app_config.as_responses_agent()
-                yield from send_log('info', "Created ResponsesAgent successfully")
-            except Exception as e:
-                import traceback
-                yield from send_error(f'Failed to create agent: {str(e)}', traceback.format_exc())
-                return
+            # Reuse a previously built agent when config and auth identity match
+            agent_key = hashlib.blake2b(
+                _canonical_key(config_dict) + b'|'
+                + (auth_token or auth_client_id or '').encode(),
+                digest_size=16,
+            ).hexdigest()
+            with _agent_cache_lock:
+                agent = _agent_cache.get(agent_key)
+                if agent is not None:
+                    _agent_cache.move_to_end(agent_key)
+
+            if agent is not None:
+                # Cached agents were built under the lock with this same
+                # (config, identity) key, so only the env refresh is needed.
+                with _env_mutation_lock:
+                    _apply_auth_env(env_updates)
+                yield from send_log('info', 'Reusing agent for unchanged configuration')
+            else:
+                # Build the agent with the env mutation and the construction
+                # itself under _env_mutation_lock, so it is provably created
+                # with this request's credentials before being cached - and
+                # never interleaved with another chat's or deployment's auth
+                # context. No yields happen while the lock is held; log lines
+                # are buffered and replayed after release.
+                build_logs: list[tuple[str, str]] = []
+                build_error: tuple[str, str] | None = None
+                with _env_mutation_lock:
+                    _apply_auth_env(env_updates)
+                    # Create AppConfig from the configuration
+                    try:
+                        app_config = AppConfig(**config_dict)
+                        build_logs.append(('info', f"Created AppConfig for app: {app_config.app.name}"))
+
+                        # Log agent details
+                        agent_names = list(config_dict.get('agents', {}).keys())
+                        build_logs.append(('debug', f"Agents: {', '.join(agent_names)}"))
+
+                        # Log orchestration type
+                        orch = config_dict.get('app', {}).get('orchestration', {})
+                        if orch.get('supervisor'):
+                            build_logs.append(('debug', f"Orchestration: Supervisor ({orch['supervisor'].get('name', 'unnamed')})"))
+                        elif orch.get('swarm'):
+                            build_logs.append(('debug', f"Orchestration: Swarm ({orch['swarm'].get('name', 'unnamed')})"))
+                        elif orch.get('deep_agent'):
+                            build_logs.append(('debug', f"Orchestration: Deep Agent ({orch['deep_agent'].get('name', 'unnamed')})"))
+                    except Exception as e:
+                        build_error = (f'Invalid configuration: {str(e)}', traceback.format_exc())
+
+                    # Create the ResponsesAgent
+                    if build_error is None:
+                        try:
+                            build_logs.append(('info', 'Creating LangGraph from configuration...'))
+                            agent = app_config.as_responses_agent()
+                            build_logs.append(('info', "Created ResponsesAgent successfully"))
+                        except Exception as e:
+                            build_error = (f'Failed to create agent: {str(e)}', traceback.format_exc())
+
+                for level, message in build_logs:
+                    yield from send_log(level, message)
+                if build_error is not None:
+                    yield from send_error(*build_error)
+                    return
+
+                with _agent_cache_lock:
+                    _agent_cache[agent_key] = agent
+                    while len(_agent_cache) > _AGENT_CACHE_MAX:
+                        _agent_cache.popitem(last=False)
             
             # Build the request for the ResponsesAgent
-            from mlflow.types.responses import ResponsesAgentRequest
-            
             yield from send_log('debug', 'Building ResponsesAgentRequest...')
             
             # Build input items from messages
-            input_items = []
-            for msg in messages:
-                role = msg.get('role', 'user')
-                content = msg.get('content', '')
-                
-                if role == 'user':
-                    input_items.append({
-                        'type': 'message',
-                        'role': 'user',
-                        'content': [{'type': 'input_text', 'text': content}]
-                    })
-                elif role == 'assistant':
-                    input_items.append({
-                        'type': 'message',
-                        'role': 'assistant',
-                        'content': [{'type': 'output_text', 'text': content}]
-                    })
+            input_items = [
+                _ROLE_WRAP[role](msg.get('content', ''))
+                for msg in messages
+                if (role := msg.get('role', 'user')) in _ROLE_WRAP
+            ]
             
             # Build context/custom data
             custom_data = {}
@@ -4266,37 +5261,128 @@ def chat_with_agent():
                 custom_outputs = None
                 if hasattr(agent, 'predict_stream'):
                     yield from send_log('debug', "Using streaming mode")
-                    
-                    for event in agent.predict_stream(agent_request):
-                        # Extract delta content from the event
-                        if hasattr(event, 'type'):
-                            if event.type == 'response.output_text.delta':
-                                # Text delta event
-                                delta = getattr(event, 'delta', '')
-                                if delta:
-                                    full_response += delta
-                                    yield from send_delta(delta)
-                            elif event.type == 'response.output_item.done':
-                                # Item complete - extract full text if available
-                                if hasattr(event, 'item') and hasattr(event.item, 'content'):
-                                    for content_item in event.item.content:
-                                        if hasattr(content_item, 'text'):
-                                            # Use full text if we didn't get deltas
-                                            if not full_response:
-                                                full_response = content_item.text
-                                # Extract custom_outputs if available
-                                yield from send_log('debug', f"Checking for custom_outputs on event: hasattr={hasattr(event, 'custom_outputs')}")
-                                if hasattr(event, 'custom_outputs'):
-                                    yield from send_log('debug', f"custom_outputs value: {event.custom_outputs}")
-                                    if event.custom_outputs:
-                                        custom_outputs = event.custom_outputs
-                                        yield from send_log('debug', f"Captured custom_outputs")
+
+                    # Per-stream accumulator shared with the typed handlers below
+                    state = {'full_response': '', 'custom_outputs': None}
+
+                    def _handle_delta(event):
+                        # Text delta event - known shape, no per-token hasattr
+                        delta = event.delta
+                        if delta:
+                            state['full_response'] += delta
+                            yield from send_delta(delta)
+
+                    def _handle_item_done(event):
+                        # Item complete - use its full text if we got no deltas
+                        item = getattr(event, 'item', None)
+                        content = getattr(item, 'content', None)
+                        if content and not state['full_response']:
+                            for content_item in content:
+                                text = getattr(content_item, 'text', None)
+                                if text:
+                                    state['full_response'] = text
+                                    break
+                        custom = getattr(event, 'custom_outputs', None)
+                        if custom:
+                            state['custom_outputs'] = custom
+                            yield from send_log('debug', "Captured custom_outputs")
+
+                    handlers = {
+                        'response.output_text.delta': _handle_delta,
+                        'response.output_item.done': _handle_item_done,
+                    }
+
+                    # Drain the (blocking) agent stream in a worker thread and
+                    # consume through a queue with a timeout, so stalls in the
+                    # upstream LLM produce keep-alive comment frames instead of
+                    # an idle connection that proxies eventually kill.
+                    event_queue: queue.Queue = queue.Queue(maxsize=64)
+                    # Set when the consumer stops (normal completion or the
+                    # SSE client disconnecting); tells the pump to bail out
+                    # instead of blocking forever on a queue nobody drains.
+                    stream_stopped = threading.Event()
+
+                    def _put(item) -> bool:
+                        """Bounded put that gives up once the consumer is gone."""
+                        while not stream_stopped.is_set():
+                            try:
+                                event_queue.put(item, timeout=1)
+                                return True
+                            except queue.Full:
+                                continue
+                        return False
+
+                    def _pump():
+                        stream = None
+                        try:
+                            stream = agent.predict_stream(agent_request)
+                            for ev in stream:
+                                if not _put(ev):
+                                    return
+                            _put(_STREAM_DONE)
+                        except BaseException as pump_err:  # surfaced in the consumer
+                            _put(pump_err)
+                        finally:
+                            # Release the upstream LLM stream even when the
+                            # client abandoned the chat mid-generation.
+                            close = getattr(stream, 'close', None)
+                            if close is not None:
+                                try:
+                                    close()
+                                except Exception:
+                                    pass
+
+                    _CHAT_PUMP_EXECUTOR.submit(_pump)
+
+                    try:
+                        while True:
+                            try:
+                                event = event_queue.get(timeout=_SSE_KEEPALIVE_SECONDS)
+                            except queue.Empty:
+                                # SSE comment frame - ignored by clients, keeps the
+                                # connection warm through proxies
+                                yield b': keepalive\n\n'
+                                continue
+                            if event is _STREAM_DONE:
+                                break
+                            if isinstance(event, BaseException):
+                                raise event
+                            handler = handlers.get(getattr(event, 'type', None))
+                            if handler:
+                                yield from handler(event)
+                    finally:
+                        # Runs on GeneratorExit too (client disconnect closes
+                        # the generator): unblock the pump so its worker is
+                        # returned to _CHAT_PUMP_EXECUTOR.
+                        stream_stopped.set()
+
+                    full_response = state['full_response']
+                    custom_outputs = state['custom_outputs']
                 else:
-                    # Fallback to non-streaming mode
+                    # Fallback to non-streaming mode. The predict call still
+                    # runs on the pump pool so keep-alives flow while the full
+                    # response is being generated.
                     yield from send_log('warning', "Streaming not available, using standard mode")
-                    
-                    response = agent.predict(agent_request)
-                    
+
+                    result_queue: queue.Queue = queue.Queue(maxsize=1)
+
+                    def _predict():
+                        try:
+                            result_queue.put(('ok', agent.predict(agent_request)))
+                        except BaseException as predict_err:  # surfaced below
+                            result_queue.put(('err', predict_err))
+
+                    _CHAT_PUMP_EXECUTOR.submit(_predict)
+                    while True:
+                        try:
+                            kind, payload = result_queue.get(timeout=_SSE_KEEPALIVE_SECONDS)
+                            break
+                        except queue.Empty:
+                            yield b': keepalive\n\n'
+                    if kind == 'err':
+                        raise payload
+                    response = payload
+
                     if response and response.output:
                         for item in response.output:
                             if hasattr(item, 'content'):
@@ -4326,21 +5412,24 @@ def chat_with_agent():
                     yield from send_log('debug', f"Raw custom_outputs type: {type(custom_outputs).__name__}")
                     yield from send_log('debug', f"Raw custom_outputs keys: {list(custom_outputs.keys()) if hasattr(custom_outputs, 'keys') else 'N/A'}")
                     
-                    # Convert to dict if it's a Pydantic model or similar
-                    if hasattr(custom_outputs, 'model_dump'):
+                    # Convert to dict if it's a Pydantic model or similar.
+                    # isinstance is a C type check, vs. hasattr's guarded
+                    # attribute lookups; pydantic is already loaded via dao-ai.
+                    from pydantic import BaseModel
+                    if isinstance(custom_outputs, BaseModel):
                         custom_outputs = custom_outputs.model_dump()
-                    elif hasattr(custom_outputs, 'dict'):
-                        custom_outputs = custom_outputs.dict()
                     elif not isinstance(custom_outputs, dict):
                         custom_outputs = dict(custom_outputs)
                     
                     # Filter out configurable from custom_outputs for display
-                    display_outputs = {k: v for k, v in custom_outputs.items() if k != 'configurable'}
+                    # (C-level copy + pop rather than a Python-level comprehension)
+                    display_outputs = {**custom_outputs}
+                    display_outputs.pop('configurable', None)
                     
                     if display_outputs:
                         yield from send_log('info', f"Custom outputs received: {list(display_outputs.keys())}")
                         try:
-                            yield f"data: {json.dumps({'type': 'custom_outputs', 'data': display_outputs})}\n\n"
+                            yield _sse_event({'type': 'custom_outputs', 'data': display_outputs})
                         except (TypeError, ValueError) as e:
                             yield from send_log('warning', f"Could not serialize custom_outputs: {str(e)}")
                     else:
@@ -4349,12 +5438,10 @@ def chat_with_agent():
                 yield from send_done(full_response)
                 
             except Exception as e:
-                import traceback
                 yield from send_error(f'Agent invocation failed: {str(e)}', traceback.format_exc())
                 return
                 
         except Exception as e:
-            import traceback
             yield from send_error(str(e), traceback.format_exc())
     
     return Response(generate(), mimetype='text/event-stream', headers={
@@ -4368,37 +5455,82 @@ def chat_with_agent():
 # Static File Serving
 # =============================================================================
 
+@lru_cache(maxsize=1)
+def _index_html():
+    """Load the SPA shell into memory once, with a strong ETag.
+
+    Returns None when index.html is missing (e.g. frontend not built yet) so
+    callers can fall back to the filesystem path and its error handling.
+    """
+    try:
+        with open(os.path.join(STATIC_FOLDER, 'index.html'), 'rb') as f:
+            body = f.read()
+    except OSError:
+        return None
+    return body, hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def _serve_index():
+    """Serve the cached SPA shell, honoring If-None-Match with a 304."""
+    cached = _index_html()
+    if cached is None:
+        return send_from_directory(STATIC_FOLDER, 'index.html')
+
+    body, etag = cached
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if request.if_none_match and etag in request.if_none_match:
+        return app.response_class(status=304, headers=headers)
+    return app.response_class(body, mimetype='text/html', headers=headers)
+
+
 @app.route('/')
 def index():
     """Serve the React frontend."""
-    return send_from_directory(STATIC_FOLDER, 'index.html')
+    return _serve_index()
+
+
+@app.route('/api/<path:_unmatched>', methods=['GET', 'POST', 'PUT', 'DELETE', 'PATCH'])
+def api_not_found(_unmatched: str):
+    """404 for unknown API paths at the routing layer.
+
+    The static prefix makes this rule more specific than the SPA catch-all,
+    so misses never run the filesystem probe in serve_static.
+    """
+    return jsonify({'error': 'Not found'}), 404
 
 
 @app.route('/<path:path>')
 def serve_static(path: str):
     """Serve static files or fall back to index.html for SPA routing."""
-    if path.startswith('api/'):
-        return jsonify({'error': 'Not found'}), 404
-    
     file_path = os.path.join(STATIC_FOLDER, path)
     if os.path.isfile(file_path):
+        # Content-hashed bundles are immutable - let browsers cache them hard.
+        # send_from_directory is conditional, so other files still get 304s.
+        if path.startswith('assets/'):
+            response = send_from_directory(STATIC_FOLDER, path, max_age=_ASSET_CACHE_MAX_AGE)
+            # immutable stops revalidation requests entirely for hashed bundles
+            response.headers['Cache-Control'] = f'public, max-age={_ASSET_CACHE_MAX_AGE}, immutable'
+            return response
         return send_from_directory(STATIC_FOLDER, path)
-    
+
     # SPA fallback - serve index.html for client-side routing
-    return send_from_directory(STATIC_FOLDER, 'index.html')
+    return _serve_index()
 
 
 # =============================================================================
 # Version Info
 # =============================================================================
 
-@app.route('/api/version')
-def get_version():
-    """Get the dao-ai library version."""
-    # First check for DAO_AI_VERSION environment variable (set in app.yaml)
+@lru_cache(maxsize=1)
+def _dao_ai_version() -> str:
+    """Resolve the installed dao-ai version once per process.
+
+    Lazy (not at import) so the DAO_AI_VERSION env override still works after
+    dotenv loading; importlib.metadata scans dist-info on every call, so the
+    probe shouldn't sit on the request path.
+    """
     dao_ai_version = os.environ.get('DAO_AI_VERSION')
-    
-    # If not set, try to get from installed package
+
     if not dao_ai_version:
         try:
             import importlib.metadata
@@ -4412,71 +5544,43 @@ def get_version():
                     pass
         except Exception as e:
             log('warning', f"Could not get dao-ai version: {e}")
-    
-    if not dao_ai_version:
-        dao_ai_version = 'unknown'
-    
+
+    return dao_ai_version or 'unknown'
+
+
+@app.route('/api/version')
+def get_version():
+    """Get the dao-ai library version."""
     return jsonify({
-        'dao_ai': dao_ai_version,
+        'dao_ai': _dao_ai_version(),
         'app': 'dao-ai-builder',
     })
 
 
-@app.route('/api/github-config')
-def get_github_config():
-    """Get GitHub repository configuration for config templates."""
-    return jsonify({
+@lru_cache(maxsize=1)
+def _github_config() -> dict:
+    """Read the GitHub template-repo settings once; they're fixed per process."""
+    return {
         'repo': os.environ.get('GITHUB_CONFIG_REPO', 'natefleming/dao-ai'),
         'branch': os.environ.get('GITHUB_CONFIG_BRANCH', 'main'),
         'path': os.environ.get('GITHUB_CONFIG_PATH', 'config'),
-    })
+    }
+
+
+@app.route('/api/github-config')
+def get_github_config():
+    """Get GitHub repository configuration for config templates."""
+    return jsonify(_github_config())
 
 
 # =============================================================================
 # AI Prompt Assistant
 # =============================================================================
 
-@app.route('/api/ai/generate-prompt', methods=['POST'])
-def generate_prompt():
-    """Generate an optimized prompt using Claude for GenAI agent applications.
-    
-    Request body:
-    - context: Description of what the agent should do
-    - agent_name: Name of the agent (optional)
-    - agent_description: Description of the agent (optional)
-    - tools: List of tools available to the agent (optional)
-    - existing_prompt: Existing prompt to improve (optional)
-    - template_parameters: List of template variables to include (optional)
-    
-    Returns:
-    - prompt: Generated optimized prompt
-    """
-    try:
-        data = request.get_json()
-        context = data.get('context', '')
-        agent_name = data.get('agent_name', '')
-        agent_description = data.get('agent_description', '')
-        tools = data.get('tools', [])
-        existing_prompt = data.get('existing_prompt', '')
-        template_parameters = data.get('template_parameters', [])
-        
-        if not context and not existing_prompt:
-            return jsonify({'error': 'Either context or existing_prompt is required'}), 400
-        
-        # Use the app's service principal credentials for the serving endpoint
-        # The serving endpoint is configured as an app resource with CAN_QUERY permission
-        log('info', "Generating prompt using Claude with app service principal")
-        
-        # Build template parameters instruction
-        template_params_instruction = ""
-        if template_parameters:
-            params_formatted = ", ".join([f"{{{p}}}" for p in template_parameters])
-            template_params_instruction = f"\n7. IMPORTANT: Include these template variables in a User Information section at the start of the prompt: {params_formatted}"
-        else:
-            template_params_instruction = "\n7. Use template variables like {user_id}, {store_num}, {context} for dynamic information"
-        
-        # Build the system message for prompt generation
-        system_message = f"""You are an expert prompt engineer specializing in creating highly effective system prompts for AI agents. Your task is to generate optimized prompts for GenAI agent applications that follow best practices.
+# System messages for the AI prompt-generator endpoints. These are static (or
+# nearly so) and large, so they live at module level instead of being rebuilt
+# on every request.
+_SYSTEM_MSG_PROMPT = """You are an expert prompt engineer specializing in creating highly effective system prompts for AI agents. Your task is to generate optimized prompts for GenAI agent applications that follow best practices.
 
 When creating prompts, follow these guidelines:
 1. Be specific and clear about the agent's role and responsibilities
@@ -4491,76 +5595,521 @@ When creating prompts, follow these guidelines:
 
 Output ONLY the prompt text, without any additional explanation or markdown formatting."""
 
-        # Build the user message
-        user_parts = []
-        
-        if existing_prompt:
-            user_parts.append(f"Please improve and optimize this existing prompt:\n\n{existing_prompt}")
-        else:
-            user_parts.append(f"Please create an optimized system prompt for the following agent:")
-        
-        if agent_name:
-            user_parts.append(f"\nAgent Name: {agent_name}")
-        
-        if agent_description:
-            user_parts.append(f"\nAgent Description: {agent_description}")
-        
-        if context:
-            user_parts.append(f"\nContext/Requirements: {context}")
-        
-        if tools:
-            tools_str = ", ".join(tools) if isinstance(tools, list) else str(tools)
-            user_parts.append(f"\nAvailable Tools: {tools_str}")
-            user_parts.append("\nInclude clear instructions for when and how to use these tools.")
-        
-        if template_parameters:
-            params_list = ", ".join([f"{{{p}}}" for p in template_parameters])
-            user_parts.append(f"\nTemplate Parameters to include: {params_list}")
-            user_parts.append("Include a '### User Information' section at the beginning that displays these parameters.")
-        
-        user_message = "\n".join(user_parts)
-        
-        # Call the Databricks serving endpoint using the SDK
-        # This uses the app's service principal credentials automatically
+_SYSTEM_MSG_GUARDRAIL = """You are an expert prompt engineer specializing in creating guardrail evaluation prompts for AI agents. Your task is to generate optimized guardrail prompts that effectively evaluate AI responses.
+
+When creating guardrail prompts, follow these guidelines:
+1. Clearly define the role as an expert judge evaluating AI responses
+2. Include specific, measurable evaluation criteria
+3. Provide clear pass/fail conditions for each criterion
+4. Include instructions for the judge to output structured feedback
+5. Use {inputs} placeholder for the user's original query/conversation
+6. Use {outputs} placeholder for the AI's response being evaluated
+7. Make the evaluation criteria objective and actionable
+8. Include instructions to provide constructive feedback when the response fails
+9. Structure the output to include both a pass/fail decision and detailed reasoning
+
+Output ONLY the prompt text, without any additional explanation or markdown formatting."""
+
+_SYSTEM_MSG_HANDOFF = """You are an expert at designing multi-agent AI systems. Your task is to generate concise handoff prompts that describe when a specific agent should be called.
+
+A handoff prompt is used by a supervisor or orchestrator agent to decide which specialized agent should handle a user's request. The handoff prompt should:
+
+1. Be concise and action-oriented (1-3 sentences max)
+2. Clearly describe the TYPE of requests or tasks this agent handles
+3. Include specific keywords or topics that should trigger routing to this agent
+4. Differentiate this agent's responsibilities from other agents in the system
+5. Focus on WHEN to call this agent, not HOW the agent works internally
+
+Good handoff prompts are specific and decisive:
+- "Route to this agent for product searches, inventory lookups, and finding items by name, category, or SKU."
+- "Call this agent when the user needs help with order status, returns, refunds, or shipping issues."
+- "Use this agent for technical troubleshooting, installation help, and product compatibility questions."
+
+Avoid vague descriptions like "handles general questions" or "helps with various tasks."
+
+Output ONLY the handoff prompt text, without any additional explanation or formatting."""
+
+_SYSTEM_MSG_SUPERVISOR = """You are an expert at designing multi-agent AI orchestration systems. Your task is to generate an effective supervisor prompt that guides an orchestrator agent in routing user requests to specialized agents.
+
+A supervisor prompt should:
+
+1. Clearly define the supervisor's role as a router/orchestrator
+2. List each available agent with a clear description of when to route to them
+3. Include decision-making criteria for ambiguous requests
+4. Define a default agent or fallback behavior
+5. Include instructions for handling multi-step requests that may need multiple agents
+6. Be clear about maintaining conversation context across agent handoffs
+7. Include safety guidelines (don't make up information, admit when unsure)
+
+The prompt should be structured with clear sections:
+- Role Definition
+- Available Agents (with routing criteria for each)
+- Decision Guidelines
+- Response Format Guidelines
+- Safety Guidelines
+
+Output ONLY the prompt text, without any additional explanation or markdown code fences."""
+
+
+# Bounds for prompt-generator request bodies; generous for real use but cheap
+# to enforce before any message assembly or LLM spend
+_MAX_PROMPT_TEXT_LEN = 20000
+_MAX_PROMPT_LIST_ITEMS = 64
+
+
+def _validate_prompt_fields(data: dict, text_fields: tuple = (), list_fields: tuple = ()) -> str | None:
+    """Cheap type/size validation for prompt-generator request bodies.
+
+    Returns an error message for the first offending field, or None when the
+    payload is acceptable, so malformed or oversized requests get a 400 in
+    microseconds instead of after message assembly.
+    """
+    for field in text_fields:
+        value = data.get(field)
+        if value is None or value == '':
+            continue
+        if not isinstance(value, str):
+            return f"'{field}' must be a string"
+        if len(value) > _MAX_PROMPT_TEXT_LEN:
+            return f"'{field}' is too long (max {_MAX_PROMPT_TEXT_LEN} characters)"
+    for field in list_fields:
+        value = data.get(field)
+        if value is None:
+            continue
+        if not isinstance(value, list):
+            return f"'{field}' must be a list"
+        if len(value) > _MAX_PROMPT_LIST_ITEMS:
+            return f"'{field}' has too many items (max {_MAX_PROMPT_LIST_ITEMS})"
+        if not all(isinstance(item, str) for item in value):
+            return f"'{field}' items must be strings"
+    return None
+
+
+@lru_cache(maxsize=512)
+def _format_template_params(params: tuple) -> str:
+    """Render template parameter names as '{a}, {b}' once per distinct set."""
+    return ", ".join(f"{{{p}}}" for p in params)
+
+
+@lru_cache(maxsize=1024)
+def _pretty_criterion(name: str) -> str:
+    """Memoized 'some_criterion' -> 'Some Criterion' rendering."""
+    return name.replace('_', ' ').title()
+
+
+@lru_cache(maxsize=512)
+def _format_criteria(criteria: tuple) -> str:
+    """Render evaluation criteria names as 'A B, C D' once per distinct set."""
+    return ", ".join(_pretty_criterion(c) for c in criteria)
+
+
+# Exact-match response cache for the prompt-generator endpoints. Identical
+# requests (same endpoint, system message, and user message) skip the
+# multi-second Claude round-trip entirely. Entries expire so regenerated
+# prompts don't stay pinned forever.
+_PROMPT_RESPONSE_CACHE_MAX = 128
+_PROMPT_RESPONSE_TTL_SECONDS = 15 * 60
+_prompt_response_cache: OrderedDict = OrderedDict()  # key -> (expires_at, prompt)
+_prompt_response_cache_lock = threading.Lock()
+
+
+def _prompt_cache_key(kind: str, system_message: str, user_message: str) -> bytes:
+    """Build a compact cache key for a prompt-generation request."""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(kind.encode('utf-8'))
+    hasher.update(b'\x00')
+    hasher.update(system_message.encode('utf-8'))
+    hasher.update(b'\x00')
+    hasher.update(user_message.encode('utf-8'))
+    return hasher.digest()
+
+
+def _prompt_cache_get(key: bytes) -> str | None:
+    """Return a cached generated prompt, or None on miss/expiry."""
+    with _prompt_response_cache_lock:
+        entry = _prompt_response_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, prompt = entry
+        if time.time() >= expires_at:
+            del _prompt_response_cache[key]
+            return None
+        _prompt_response_cache.move_to_end(key)
+        return prompt
+
+
+def _prompt_cache_put(key: bytes, prompt: str) -> None:
+    """Store a generated prompt, evicting the least recently used entry."""
+    with _prompt_response_cache_lock:
+        _prompt_response_cache[key] = (time.time() + _PROMPT_RESPONSE_TTL_SECONDS, prompt)
+        _prompt_response_cache.move_to_end(key)
+        while len(_prompt_response_cache) > _PROMPT_RESPONSE_CACHE_MAX:
+            _prompt_response_cache.popitem(last=False)
+
+
+# Single-flight map for the prompt generators: under a retry storm or a burst
+# of identical requests, the first caller performs the Claude call and
+# concurrent duplicates block on its result instead of each paying the full
+# round-trip. Keys match the response cache, so followers also land warm.
+_inflight_prompts: dict = {}  # key -> {'event', 'prompt', 'error'}
+_inflight_prompts_lock = threading.Lock()
+
+
+def _generate_prompt_single_flight(cache_key: bytes, generate):
+    """Run generate() once per distinct in-flight request key.
+
+    The leader executes and publishes its result (or exception); concurrent
+    callers with the same key wait on the leader instead of issuing duplicate
+    serving-endpoint calls.
+    """
+    with _inflight_prompts_lock:
+        entry = _inflight_prompts.get(cache_key)
+        leader = entry is None
+        if leader:
+            entry = {'event': threading.Event(), 'prompt': None, 'error': None}
+            _inflight_prompts[cache_key] = entry
+
+    if not leader:
+        entry['event'].wait()
+        if entry['error'] is not None:
+            raise entry['error']
+        return entry['prompt']
+
+    try:
+        entry['prompt'] = generate()
+        return entry['prompt']
+    except Exception as e:
+        entry['error'] = e
+        raise
+    finally:
+        with _inflight_prompts_lock:
+            _inflight_prompts.pop(cache_key, None)
+        entry['event'].set()
+
+
+@lru_cache(maxsize=1)
+def _serving_chat_types():
+    """Resolve (ChatMessage, ChatMessageRole) once instead of per request.
+
+    The SDK stays lazily imported like everywhere else in this module, but the
+    resolved classes are cached so the hot path pays a tuple lookup rather
+    than an import-system round-trip on every call.
+    """
+    from databricks.sdk.service.serving import ChatMessage, ChatMessageRole
+    return ChatMessage, ChatMessageRole
+
+
+@lru_cache(maxsize=16)
+def _system_chat_message(content: str):
+    """Return a shared system ChatMessage for the given content.
+
+    The system messages above are static per endpoint, so the same ChatMessage
+    instance can be reused across requests instead of re-allocating one per call.
+    """
+    ChatMessage, ChatMessageRole = _serving_chat_types()
+    return ChatMessage(role=ChatMessageRole.SYSTEM, content=content)
+
+
+# Adaptive max_tokens for the prompt generators: observed output sizes are
+# tracked per endpoint and the request bound is tightened toward 1.2x the
+# recent P95, so typical generations finish sooner. The configured ceiling
+# stays the hard upper bound, and a truncated response resets the stats so
+# the cap widens back out immediately.
+_OUTPUT_STATS_WINDOW = 512
+_OUTPUT_STATS_RECOMPUTE_EVERY = 32
+_OUTPUT_STATS_MIN_SAMPLES = 20
+_OUTPUT_TOKENS_FLOOR = 200
+
+_output_stats: dict = {}  # kind -> {'samples': deque, 'inserts': int, 'p95': int | None}
+_output_stats_lock = threading.Lock()
+
+
+def _record_output_tokens(kind: str, text: str) -> None:
+    """Record the approximate token count of a completed generation."""
+    tokens = len(text) // 4  # rough chars-per-token heuristic
+    with _output_stats_lock:
+        stats = _output_stats.setdefault(kind, {
+            'samples': deque(maxlen=_OUTPUT_STATS_WINDOW),
+            'inserts': 0,
+            'p95': None,
+        })
+        stats['samples'].append(tokens)
+        stats['inserts'] += 1
+        if (stats['inserts'] % _OUTPUT_STATS_RECOMPUTE_EVERY == 0
+                and len(stats['samples']) >= _OUTPUT_STATS_MIN_SAMPLES):
+            stats['p95'] = int(statistics.quantiles(stats['samples'], n=20)[18])
+
+
+def _reset_output_stats(kind: str) -> None:
+    """Forget observed sizes for an endpoint (e.g. after a truncation)."""
+    with _output_stats_lock:
+        _output_stats.pop(kind, None)
+
+
+def _adaptive_max_tokens(kind: str, ceiling: int) -> int:
+    """Return a max_tokens bound tightened toward recent output sizes."""
+    with _output_stats_lock:
+        stats = _output_stats.get(kind)
+        p95 = stats['p95'] if stats else None
+    if p95 is None:
+        return ceiling
+    return max(_OUTPUT_TOKENS_FLOOR, min(ceiling, int(p95 * 1.2)))
+
+
+# Serving endpoint shared by all of the prompt-generator endpoints.
+#
+# Note on batching: the chat-completions invocation API accepts exactly one
+# conversation per call, so concurrent prompt-generation requests cannot be
+# coalesced into a single multi-message batch. Concurrency is instead handled
+# by the threaded gunicorn workers plus the pooled connections of the cached
+# WorkspaceClient, and duplicate requests are absorbed by the response cache.
+_CLAUDE_ENDPOINT_NAME = "databricks-claude-sonnet-4"
+
+
+def _query_claude_endpoint(system_message: str, user_message: str, max_tokens: int = 2000,
+                           kind: str | None = None) -> str:
+    """Query the shared Claude serving endpoint and return the completion text.
+
+    Goes through the cached WorkspaceClient, so the SDK's underlying HTTPS
+    session — and its pooled keep-alive connections — is reused across
+    requests instead of re-negotiating TCP/TLS for every call.
+
+    When kind is given, max_tokens is treated as a ceiling and tightened
+    toward the recent P95 of that endpoint's outputs; completed generations
+    feed the stats and truncated ones reset them.
+    """
+    ChatMessage, ChatMessageRole = _serving_chat_types()
+
+    if kind is not None:
+        max_tokens = _adaptive_max_tokens(kind, max_tokens)
+
+    def _do_query(w):
+        return w.serving_endpoints.query(
+            name=_CLAUDE_ENDPOINT_NAME,
+            messages=[
+                _system_chat_message(system_message),
+                ChatMessage(role=ChatMessageRole.USER, content=user_message),
+            ],
+            max_tokens=max_tokens,
+            temperature=0.7,
+        )
+
+    w = get_workspace_client()
+    try:
+        response = _do_query(w)
+    except Exception as e:
+        if not _is_auth_error(e):
+            raise
+        # Cached client's credentials expired; rebuild once and retry
+        log('warning', f"Claude endpoint query hit an auth error, refreshing client: {e}")
+        _invalidate_workspace_client(w)
+        response = _do_query(get_workspace_client())
+
+    if not response.choices or len(response.choices) == 0:
+        return ''
+    choice = response.choices[0]
+    content = choice.message.content or ''
+    if kind is not None:
+        if str(getattr(choice, 'finish_reason', '') or '') == 'length':
+            log('warning', f"{kind} generation hit the adaptive max_tokens bound ({max_tokens}); widening back to the ceiling")
+            _reset_output_stats(kind)
+        elif content:
+            _record_output_tokens(kind, content)
+    return content
+
+
+def _stream_claude_endpoint(system_message: str, user_message: str, max_tokens: int = 2000):
+    """Yield completion text chunks from the Claude serving endpoint.
+
+    The SDK's serving_endpoints.query() only returns buffered responses, so
+    streaming posts to the invocations REST endpoint directly, reusing the
+    cached WorkspaceClient's host and auth headers.
+    """
+    w = get_workspace_client()
+    url = f"{w.config.host.rstrip('/')}/serving-endpoints/{_CLAUDE_ENDPOINT_NAME}/invocations"
+    headers = {'Content-Type': 'application/json', **w.config.authenticate()}
+    payload = {
+        'messages': [
+            {'role': 'system', 'content': system_message},
+            {'role': 'user', 'content': user_message},
+        ],
+        'max_tokens': max_tokens,
+        'temperature': 0.7,
+        'stream': True,
+    }
+    with _http_session.post(url, headers=headers, json=payload, stream=True, timeout=120) as resp:
+        resp.raise_for_status()
+        for line in resp.iter_lines():
+            if not line or not line.startswith(b'data: '):
+                continue
+            data = line[len(b'data: '):]
+            if data == b'[DONE]':
+                break
+            try:
+                chunk = json.loads(data)
+            except ValueError:
+                continue
+            choices = chunk.get('choices') or []
+            if not choices:
+                continue
+            content = (choices[0].get('delta') or {}).get('content')
+            if content:
+                yield content
+
+
+def _stream_prompt_response(kind: str, system_message: str, user_message: str,
+                            max_tokens: int = 2000) -> Response:
+    """Stream a prompt generation as SSE instead of buffering the completion.
+
+    Emits {'type': 'delta'} events as chunks arrive and a final
+    {'type': 'done'} event carrying the full prompt. Cache hits are replayed
+    as a single delta, and completed streams populate the response cache.
+    """
+    cache_key = _prompt_cache_key(kind, system_message, user_message)
+
+    def generate():
+        cached_prompt = _prompt_cache_get(cache_key)
+        if cached_prompt is not None:
+            yield _sse_event({'type': 'delta', 'content': cached_prompt})
+            yield _sse_event({'type': 'done', 'prompt': cached_prompt})
+            return
+        parts = []
+        try:
+            for chunk in _stream_claude_endpoint(system_message, user_message, max_tokens):
+                parts.append(chunk)
+                yield _sse_event({'type': 'delta', 'content': chunk})
+        except Exception as e:
+            log('error', f"Streaming {kind} prompt generation failed: {e}")
+            yield _sse_event({'type': 'error', 'message': str(e)})
+            return
+        generated_prompt = ''.join(parts).strip()
+        if generated_prompt:
+            _prompt_cache_put(cache_key, generated_prompt)
+        yield _sse_event({'type': 'done', 'prompt': generated_prompt})
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'Connection': 'keep-alive',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@app.route('/api/ai/generate-prompt', methods=['POST'])
+def generate_prompt():
+    """Generate an optimized prompt using Claude for GenAI agent applications.
+    
+    Request body:
+    - context: Description of what the agent should do
+    - agent_name: Name of the agent (optional)
+    - agent_description: Description of the agent (optional)
+    - tools: List of tools available to the agent (optional)
+    - existing_prompt: Existing prompt to improve (optional)
+    - template_parameters: List of template variables to include (optional)
+    
+    Returns:
+    - prompt: Generated optimized prompt
+    """
+    try:
+        data = _get_request_json()
+        context = data.get('context', '')
+        agent_name = data.get('agent_name', '')
+        agent_description = data.get('agent_description', '')
+        tools = data.get('tools', [])
+        existing_prompt = data.get('existing_prompt', '')
+        template_parameters = data.get('template_parameters', [])
+        
+        if not context and not existing_prompt:
+            return jsonify({'error': 'Either context or existing_prompt is required'}), 400
+
+        error = _validate_prompt_fields(
+            data,
+            text_fields=('context', 'agent_name', 'agent_description', 'existing_prompt'),
+            list_fields=('template_parameters',),
+        )
+        if error:
+            return jsonify({'error': error}), 400
+
+        # Use the app's service principal credentials for the serving endpoint
+        # The serving endpoint is configured as an app resource with CAN_QUERY permission
+        log('info', "Generating prompt using Claude with app service principal")
+        
+        # Build template parameters instruction (formatted once, reused below)
+        if template_parameters:
+            params_formatted = _format_template_params(tuple(template_parameters))
+            template_params_instruction = f"\n7. IMPORTANT: Include these template variables in a User Information section at the start of the prompt: {params_formatted}"
+        else:
+            params_formatted = ""
+            template_params_instruction = "\n7. Use template variables like {user_id}, {store_num}, {context} for dynamic information"
+        
+        # Build the system message for prompt generation (only the template
+        # parameter instruction varies per request)
+        system_message = _SYSTEM_MSG_PROMPT.format(
+            template_params_instruction=template_params_instruction
+        )
+
+        # Build the user message directly into a string buffer
+        buf = io.StringIO()
+        write = buf.write
+
+        if existing_prompt:
+            write(f"Please improve and optimize this existing prompt:\n\n{existing_prompt}")
+        else:
+            write("Please create an optimized system prompt for the following agent:")
+
+        if agent_name:
+            write(f"\n\nAgent Name: {agent_name}")
+
+        if agent_description:
+            write(f"\n\nAgent Description: {agent_description}")
+
+        if context:
+            write(f"\n\nContext/Requirements: {context}")
+
+        if tools:
+            tools_str = ", ".join(tools) if isinstance(tools, list) else str(tools)
+            write(f"\n\nAvailable Tools: {tools_str}")
+            write("\n\nInclude clear instructions for when and how to use these tools.")
+
+        if template_parameters:
+            write(f"\n\nTemplate Parameters to include: {params_formatted}")
+            write("\nInclude a '### User Information' section at the beginning that displays these parameters.")
+
+        user_message = buf.getvalue()
+
+        if request.args.get('stream', 'false').lower() == 'true':
+            return _stream_prompt_response('prompt', system_message, user_message, max_tokens=2000)
+
+        cache_key = _prompt_cache_key('prompt', system_message, user_message)
+        cached_prompt = _prompt_cache_get(cache_key)
+        if cached_prompt is not None:
+            log('info', "Serving generated prompt from response cache")
+            return fast_jsonify({'prompt': cached_prompt})
+        
+        # Call the Databricks serving endpoint using the SDK
+        # This uses the app's service principal credentials automatically
         try:
-            from databricks.sdk.service.serving import ChatMessage, ChatMessageRole
-            
-            w = get_workspace_client()
-            
-            messages = [
-                ChatMessage(role=ChatMessageRole.SYSTEM, content=system_message),
-                ChatMessage(role=ChatMessageRole.USER, content=user_message)
-            ]
-            
             log('info', "Calling Claude endpoint via SDK serving_endpoints.query()")
-            
-            response = w.serving_endpoints.query(
-                name="databricks-claude-sonnet-4",
-                messages=messages,
-                max_tokens=2000,
-                temperature=0.7
+
+            generated_prompt = _generate_prompt_single_flight(
+                cache_key,
+                lambda: _query_claude_endpoint(system_message, user_message, max_tokens=2000, kind='prompt'),
             )
-            
-            # Extract the generated prompt from the response
-            generated_prompt = ''
-            if response.choices and len(response.choices) > 0:
-                generated_prompt = response.choices[0].message.content
-            
+
             if not generated_prompt:
-                log('error', f"No content in response: {response}")
+                log('error', "No content in Claude response")
                 return jsonify({'error': 'No response generated'}), 500
             
+            generated_prompt = generated_prompt.strip()
+            _prompt_cache_put(cache_key, generated_prompt)
             log('info', f"Successfully generated prompt ({len(generated_prompt)} chars)")
-            return jsonify({'prompt': generated_prompt.strip()})
+            return fast_jsonify({'prompt': generated_prompt})
             
         except Exception as sdk_error:
             log('error', f"SDK serving endpoint query failed: {sdk_error}")
             return jsonify({'error': f'Failed to generate prompt: {str(sdk_error)}'}), 500
             
     except Exception as e:
-        import traceback
-        log('error', f"Error generating prompt: {e}")
-        log('error', f"Traceback: {traceback.format_exc()}")
+        log('error', f"Error generating prompt: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
 
@@ -4578,7 +6127,7 @@ def generate_guardrail_prompt():
     - prompt: Generated optimized guardrail prompt
     """
     try:
-        data = request.get_json()
+        data = _get_request_json()
         context = data.get('context', '')
         guardrail_name = data.get('guardrail_name', '')
         evaluation_criteria = data.get('evaluation_criteria', [])
@@ -4586,90 +6135,72 @@ def generate_guardrail_prompt():
         
         if not context and not existing_prompt and not evaluation_criteria:
             return jsonify({'error': 'Either context, evaluation_criteria, or existing_prompt is required'}), 400
+
+        error = _validate_prompt_fields(
+            data,
+            text_fields=('context', 'guardrail_name', 'existing_prompt'),
+            list_fields=('evaluation_criteria',),
+        )
+        if error:
+            return jsonify({'error': error}), 400
         
         # Use the app's service principal credentials for the serving endpoint
         log('info', "Generating guardrail prompt using Claude with app service principal")
         
-        # Build criteria instruction
-        criteria_instruction = ""
-        if evaluation_criteria:
-            criteria_list = "\n".join([f"- {c.replace('_', ' ').title()}" for c in evaluation_criteria])
-            criteria_instruction = f"\n\nThe guardrail should specifically evaluate these criteria:\n{criteria_list}"
-        
-        # Build the system message for guardrail prompt generation
-        system_message = f"""You are an expert prompt engineer specializing in creating guardrail evaluation prompts for AI agents. Your task is to generate optimized guardrail prompts that effectively evaluate AI responses.
+        # Static system message shared across requests
+        system_message = _SYSTEM_MSG_GUARDRAIL
 
-When creating guardrail prompts, follow these guidelines:
-1. Clearly define the role as an expert judge evaluating AI responses
-2. Include specific, measurable evaluation criteria
-3. Provide clear pass/fail conditions for each criterion
-4. Include instructions for the judge to output structured feedback
-5. Use {{inputs}} placeholder for the user's original query/conversation
-6. Use {{outputs}} placeholder for the AI's response being evaluated
-7. Make the evaluation criteria objective and actionable
-8. Include instructions to provide constructive feedback when the response fails
-9. Structure the output to include both a pass/fail decision and detailed reasoning
+        # Build the user message directly into a string buffer
+        buf = io.StringIO()
+        write = buf.write
 
-Output ONLY the prompt text, without any additional explanation or markdown formatting."""
-
-        # Build the user message
-        user_parts = []
-        
         if existing_prompt:
-            user_parts.append(f"Please improve and optimize this existing guardrail evaluation prompt:\n\n{existing_prompt}")
+            write(f"Please improve and optimize this existing guardrail evaluation prompt:\n\n{existing_prompt}")
         else:
-            user_parts.append("Please create an optimized guardrail evaluation prompt.")
-        
+            write("Please create an optimized guardrail evaluation prompt.")
+
         if guardrail_name:
-            user_parts.append(f"\nGuardrail Name: {guardrail_name}")
-        
+            write(f"\n\nGuardrail Name: {guardrail_name}")
+
         if context:
-            user_parts.append(f"\nContext/Requirements: {context}")
-        
+            write(f"\n\nContext/Requirements: {context}")
+
         if evaluation_criteria:
-            criteria_str = ", ".join([c.replace('_', ' ').title() for c in evaluation_criteria])
-            user_parts.append(f"\nEvaluation Criteria to include: {criteria_str}")
-            user_parts.append("\nMake sure each of these criteria has clear pass/fail conditions.")
-        
-        user_parts.append("\nThe prompt should use {inputs} for the conversation context and {outputs} for the AI response being evaluated.")
-        
-        user_message = "\n".join(user_parts)
-        
-        # Call the Databricks serving endpoint using the SDK
-        from databricks.sdk.service.serving import ChatMessage, ChatMessageRole
-        
-        w = get_workspace_client()
-        
-        messages = [
-            ChatMessage(role=ChatMessageRole.SYSTEM, content=system_message),
-            ChatMessage(role=ChatMessageRole.USER, content=user_message)
-        ]
+            criteria_str = _format_criteria(tuple(evaluation_criteria))
+            write(f"\n\nEvaluation Criteria to include: {criteria_str}")
+            write("\n\nMake sure each of these criteria has clear pass/fail conditions.")
+
+        write("\n\nThe prompt should use {inputs} for the conversation context and {outputs} for the AI response being evaluated.")
+
+        user_message = buf.getvalue()
+
+        if request.args.get('stream', 'false').lower() == 'true':
+            return _stream_prompt_response('guardrail', system_message, user_message, max_tokens=2000)
+
+        cache_key = _prompt_cache_key('guardrail', system_message, user_message)
+        cached_prompt = _prompt_cache_get(cache_key)
+        if cached_prompt is not None:
+            log('info', "Serving guardrail prompt from response cache")
+            return fast_jsonify({'prompt': cached_prompt})
         
         log('info', "Calling Claude endpoint for guardrail prompt via SDK serving_endpoints.query()")
-        
-        response = w.serving_endpoints.query(
-            name="databricks-claude-sonnet-4",
-            messages=messages,
-            max_tokens=2000,
-            temperature=0.7
+
+        generated_prompt = _generate_prompt_single_flight(
+            cache_key,
+            lambda: _query_claude_endpoint(system_message, user_message, max_tokens=2000, kind='guardrail'),
         )
-        
-        # Extract the generated prompt from the response
-        generated_prompt = ''
-        if response.choices and len(response.choices) > 0:
-            generated_prompt = response.choices[0].message.content
-        
+
         if not generated_prompt:
-            log('error', f"No content in response: {response}")
+            log('error', "No content in Claude response")
             return jsonify({'error': 'No response generated'}), 500
         
+        generated_prompt = generated_prompt.strip()
+        _prompt_cache_put(cache_key, generated_prompt)
         log('info', f"Successfully generated guardrail prompt ({len(generated_prompt)} chars)")
-        return jsonify({'prompt': generated_prompt.strip()})
+        return fast_jsonify({'prompt': generated_prompt})
             
     except Exception as e:
-        import traceback
-        log('error', f"Error generating guardrail prompt: {e}")
-        log('error', f"Traceback: {traceback.format_exc()}")
+        log('error', f"Error generating guardrail prompt: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
 
@@ -4691,7 +6222,7 @@ def generate_handoff_prompt():
     - prompt: Generated optimized handoff prompt
     """
     try:
-        data = request.get_json() or {}
+        data = _get_request_json() or {}
         agent_name = data.get('agent_name', '')
         agent_description = data.get('agent_description', '')
         system_prompt = data.get('system_prompt', '')
@@ -4700,90 +6231,79 @@ def generate_handoff_prompt():
         
         if not system_prompt and not existing_handoff and not agent_description:
             return jsonify({'error': 'Either system_prompt, agent_description, or existing_handoff is required'}), 400
+
+        error = _validate_prompt_fields(
+            data,
+            text_fields=('agent_name', 'agent_description', 'system_prompt', 'existing_handoff'),
+            list_fields=('other_agents',),
+        )
+        if error:
+            return jsonify({'error': error}), 400
         
         log('info', "Generating handoff prompt using Claude with app service principal")
         
-        # Build the system message for handoff prompt generation
-        system_message = """You are an expert at designing multi-agent AI systems. Your task is to generate concise handoff prompts that describe when a specific agent should be called.
-
-A handoff prompt is used by a supervisor or orchestrator agent to decide which specialized agent should handle a user's request. The handoff prompt should:
-
-1. Be concise and action-oriented (1-3 sentences max)
-2. Clearly describe the TYPE of requests or tasks this agent handles
-3. Include specific keywords or topics that should trigger routing to this agent
-4. Differentiate this agent's responsibilities from other agents in the system
-5. Focus on WHEN to call this agent, not HOW the agent works internally
+        # Static system message shared across requests
+        system_message = _SYSTEM_MSG_HANDOFF
 
-Good handoff prompts are specific and decisive:
-- "Route to this agent for product searches, inventory lookups, and finding items by name, category, or SKU."
-- "Call this agent when the user needs help with order status, returns, refunds, or shipping issues."
-- "Use this agent for technical troubleshooting, installation help, and product compatibility questions."
+        # Build the user message directly into a string buffer
+        buf = io.StringIO()
+        write = buf.write
 
-Avoid vague descriptions like "handles general questions" or "helps with various tasks."
-
-Output ONLY the handoff prompt text, without any additional explanation or formatting."""
-
-        # Build the user message
-        user_parts = []
-        
         if existing_handoff:
-            user_parts.append(f"Please improve this existing handoff prompt:\n\n{existing_handoff}")
+            write(f"Please improve this existing handoff prompt:\n\n{existing_handoff}")
         else:
-            user_parts.append("Please create a handoff prompt for this agent.")
-        
+            write("Please create a handoff prompt for this agent.")
+
         if agent_name:
-            user_parts.append(f"\nAgent Name: {agent_name}")
-        
+            write(f"\n\nAgent Name: {agent_name}")
+
         if agent_description:
-            user_parts.append(f"\nAgent Description: {agent_description}")
-        
+            write(f"\n\nAgent Description: {agent_description}")
+
         if system_prompt:
-            # Truncate very long system prompts
-            truncated_prompt = system_prompt[:2000] + "..." if len(system_prompt) > 2000 else system_prompt
-            user_parts.append(f"\nAgent's System Prompt:\n{truncated_prompt}")
-        
+            # Truncate very long system prompts; skip the slice entirely in
+            # the common short case
+            if len(system_prompt) <= 2000:
+                truncated_prompt = system_prompt
+            else:
+                truncated_prompt = system_prompt[:2000] + "..."
+            write(f"\n\nAgent's System Prompt:\n{truncated_prompt}")
+
         if other_agents:
             agents_list = ", ".join(other_agents)
-            user_parts.append(f"\nOther agents in the system: {agents_list}")
-            user_parts.append("\nMake sure the handoff prompt differentiates this agent from the others.")
-        
-        user_message = "\n".join(user_parts)
-        
-        # Call the Databricks serving endpoint using the SDK
-        from databricks.sdk.service.serving import ChatMessage, ChatMessageRole
-        
-        w = get_workspace_client()
-        
-        messages = [
-            ChatMessage(role=ChatMessageRole.SYSTEM, content=system_message),
-            ChatMessage(role=ChatMessageRole.USER, content=user_message)
-        ]
+            write(f"\n\nOther agents in the system: {agents_list}")
+            write("\n\nMake sure the handoff prompt differentiates this agent from the others.")
+
+        user_message = buf.getvalue()
+
+        if request.args.get('stream', 'false').lower() == 'true':
+            return _stream_prompt_response('handoff', system_message, user_message, max_tokens=500)
+
+        cache_key = _prompt_cache_key('handoff', system_message, user_message)
+        cached_prompt = _prompt_cache_get(cache_key)
+        if cached_prompt is not None:
+            log('info', "Serving handoff prompt from response cache")
+            return fast_jsonify({'prompt': cached_prompt})
         
         log('info', "Calling Claude endpoint for handoff prompt via SDK serving_endpoints.query()")
-        
-        response = w.serving_endpoints.query(
-            name="databricks-claude-sonnet-4",
-            messages=messages,
-            max_tokens=500,  # Handoff prompts should be concise
-            temperature=0.7
+
+        # Handoff prompts should be concise
+        generated_prompt = _generate_prompt_single_flight(
+            cache_key,
+            lambda: _query_claude_endpoint(system_message, user_message, max_tokens=500, kind='handoff'),
         )
-        
-        # Extract the generated prompt from the response
-        generated_prompt = ''
-        if response.choices and len(response.choices) > 0:
-            generated_prompt = response.choices[0].message.content
-        
+
         if not generated_prompt:
-            log('error', f"No content in response: {response}")
+            log('error', "No content in Claude response")
             return jsonify({'error': 'No response generated'}), 500
         
+        generated_prompt = generated_prompt.strip()
+        _prompt_cache_put(cache_key, generated_prompt)
         log('info', f"Successfully generated handoff prompt ({len(generated_prompt)} chars)")
-        return jsonify({'prompt': generated_prompt.strip()})
+        return fast_jsonify({'prompt': generated_prompt})
             
     except Exception as e:
-        import traceback
-        log('error', f"Error generating handoff prompt: {e}")
-        log('error', f"Traceback: {traceback.format_exc()}")
+        log('error', f"Error generating handoff prompt: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
 
@@ -4803,99 +6323,84 @@ def generate_supervisor_prompt():
     - prompt: Generated optimized supervisor prompt
     """
     try:
-        data = request.get_json() or {}
+        data = _get_request_json() or {}
         context = data.get('context', '')
         agents_data = data.get('agents', [])
         existing_prompt = data.get('existing_prompt', '')
         
         if not agents_data and not existing_prompt and not context:
             return jsonify({'error': 'At least one of agents, context, or existing_prompt is required'}), 400
+
+        error = _validate_prompt_fields(data, text_fields=('context', 'existing_prompt'))
+        if error:
+            return jsonify({'error': error}), 400
+        if not isinstance(agents_data, list):
+            return jsonify({'error': "'agents' must be a list"}), 400
+        if len(agents_data) > _MAX_PROMPT_LIST_ITEMS:
+            return jsonify({'error': f"'agents' has too many items (max {_MAX_PROMPT_LIST_ITEMS})"}), 400
+        if not all(isinstance(agent, dict) for agent in agents_data):
+            return jsonify({'error': "'agents' items must be objects"}), 400
         
         log('info', "Generating supervisor prompt using Claude with app service principal")
         
-        # Build the system message for supervisor prompt generation
-        system_message = """You are an expert at designing multi-agent AI orchestration systems. Your task is to generate an effective supervisor prompt that guides an orchestrator agent in routing user requests to specialized agents.
+        # Static system message shared across requests
+        system_message = _SYSTEM_MSG_SUPERVISOR
 
-A supervisor prompt should:
+        # Build the user message with agent information directly into a buffer
+        buf = io.StringIO()
+        write = buf.write
 
-1. Clearly define the supervisor's role as a router/orchestrator
-2. List each available agent with a clear description of when to route to them
-3. Include decision-making criteria for ambiguous requests
-4. Define a default agent or fallback behavior
-5. Include instructions for handling multi-step requests that may need multiple agents
-6. Be clear about maintaining conversation context across agent handoffs
-7. Include safety guidelines (don't make up information, admit when unsure)
-
-The prompt should be structured with clear sections:
-- Role Definition
-- Available Agents (with routing criteria for each)
-- Decision Guidelines
-- Response Format Guidelines
-- Safety Guidelines
-
-Output ONLY the prompt text, without any additional explanation or markdown code fences."""
-
-        # Build the user message with agent information
-        user_parts = []
-        
         if existing_prompt:
-            user_parts.append(f"Please improve and optimize this existing supervisor prompt:\n\n{existing_prompt}")
+            write(f"Please improve and optimize this existing supervisor prompt:\n\n{existing_prompt}")
         else:
-            user_parts.append("Please create an optimized supervisor prompt for orchestrating the following agents:")
-        
+            write("Please create an optimized supervisor prompt for orchestrating the following agents:")
+
         if agents_data:
-            user_parts.append("\n\n## Agents to Orchestrate:")
+            write("\n\n\n## Agents to Orchestrate:")
             for agent in agents_data:
                 agent_name = agent.get('name', 'Unknown')
                 agent_desc = agent.get('description', '')
                 handoff_prompt = agent.get('handoff_prompt', '')
-                
-                user_parts.append(f"\n### {agent_name}")
+
+                write(f"\n\n### {agent_name}")
                 if agent_desc:
-                    user_parts.append(f"Description: {agent_desc}")
+                    write(f"\nDescription: {agent_desc}")
                 if handoff_prompt:
-                    user_parts.append(f"When to route here: {handoff_prompt}")
-        
+                    write(f"\nWhen to route here: {handoff_prompt}")
+
         if context:
-            user_parts.append(f"\n\n## Additional Requirements:\n{context}")
-        
-        user_message = "\n".join(user_parts)
-        
-        # Call the Databricks serving endpoint using the SDK
-        from databricks.sdk.service.serving import ChatMessage, ChatMessageRole
-        
-        w = get_workspace_client()
-        
-        messages = [
-            ChatMessage(role=ChatMessageRole.SYSTEM, content=system_message),
-            ChatMessage(role=ChatMessageRole.USER, content=user_message)
-        ]
+            write(f"\n\n\n## Additional Requirements:\n{context}")
+
+        user_message = buf.getvalue()
+
+        if request.args.get('stream', 'false').lower() == 'true':
+            return _stream_prompt_response('supervisor', system_message, user_message, max_tokens=3000)
+
+        cache_key = _prompt_cache_key('supervisor', system_message, user_message)
+        cached_prompt = _prompt_cache_get(cache_key)
+        if cached_prompt is not None:
+            log('info', "Serving supervisor prompt from response cache")
+            return fast_jsonify({'prompt': cached_prompt})
         
         log('info', "Calling Claude endpoint for supervisor prompt via SDK serving_endpoints.query()")
-        
-        response = w.serving_endpoints.query(
-            name="databricks-claude-sonnet-4",
-            messages=messages,
-            max_tokens=3000,  # Supervisor prompts can be longer
-            temperature=0.7
+
+        # Supervisor prompts can be longer
+        generated_prompt = _generate_prompt_single_flight(
+            cache_key,
+            lambda: _query_claude_endpoint(system_message, user_message, max_tokens=3000, kind='supervisor'),
         )
-        
-        # Extract the generated prompt from the response
-        generated_prompt = ''
-        if response.choices and len(response.choices) > 0:
-            generated_prompt = response.choices[0].message.content
-        
+
         if not generated_prompt:
-            log('error', f"No content in response: {response}")
+            log('error', "No content in Claude response")
             return jsonify({'error': 'No response generated'}), 500
         
+        generated_prompt = generated_prompt.strip()
+        _prompt_cache_put(cache_key, generated_prompt)
         log('info', f"Successfully generated supervisor prompt ({len(generated_prompt)} chars)")
-        return jsonify({'prompt': generated_prompt.strip()})
+        return fast_jsonify({'prompt': generated_prompt})
             
     except Exception as e:
-        import traceback
-        log('error', f"Error generating supervisor prompt: {e}")
-        log('error', f"Traceback: {traceback.format_exc()}")
+        log('error', f"Error generating supervisor prompt: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
 
@@ -4913,7 +6418,7 @@ def generate_middleware_prompt():
     - prompt: Generated optimized prompt
     """
     try:
-        data = request.get_json()
+        data = _get_request_json()
         middleware_type = data.get('middleware_type', '')
         context = data.get('context', '')
         existing_prompt = data.get('existing_prompt', '')
@@ -4921,7 +6426,14 @@ def generate_middleware_prompt():
         
         if not context and not existing_prompt:
             return jsonify({'error': 'Either context or existing_prompt is required'}), 400
-        
+
+        error = _validate_prompt_fields(
+            data,
+            text_fields=('middleware_type', 'context', 'existing_prompt', 'middleware_name'),
+        )
+        if error:
+            return jsonify({'error': error}), 400
+
         log('info', f"Generating middleware prompt for type '{middleware_type}' using Claude")
         
         # Middleware-type-specific system messages
@@ -5023,40 +6535,19 @@ Output ONLY the prompt text, without any additional explanation or markdown form
         
         user_message = "\n".join(user_parts)
         
-        # Call the Databricks serving endpoint
-        from databricks.sdk.service.serving import ChatMessage, ChatMessageRole
-        
-        w = get_workspace_client()
-        
-        messages = [
-            ChatMessage(role=ChatMessageRole.SYSTEM, content=system_message),
-            ChatMessage(role=ChatMessageRole.USER, content=user_message)
-        ]
-        
         log('info', "Calling Claude endpoint for middleware prompt via SDK serving_endpoints.query()")
-        
-        response = w.serving_endpoints.query(
-            name="databricks-claude-sonnet-4",
-            messages=messages,
-            max_tokens=2000,
-            temperature=0.7
-        )
-        
-        generated_prompt = ''
-        if response.choices and len(response.choices) > 0:
-            generated_prompt = response.choices[0].message.content
-        
+
+        generated_prompt = _query_claude_endpoint(system_message, user_message, max_tokens=2000, kind='middleware')
+
         if not generated_prompt:
-            log('error', f"No content in response: {response}")
+            log('error', "No content in Claude response")
             return jsonify({'error': 'No response generated'}), 500
         
         log('info', f"Successfully generated middleware prompt ({len(generated_prompt)} chars)")
-        return jsonify({'prompt': generated_prompt.strip()})
+        return fast_jsonify({'prompt': generated_prompt.strip()})
             
     except Exception as e:
-        import traceback
-        log('error', f"Error generating middleware prompt: {e}")
-        log('error', f"Traceback: {traceback.format_exc()}")
+        log('error', f"Error generating middleware prompt: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
 
@@ -5071,17 +6562,24 @@ def main():
     
     port = os.environ.get('PORT', '8000')
     workers = os.environ.get('WORKERS', '2')
+    threads = os.environ.get('THREADS', '8')
     timeout = os.environ.get('TIMEOUT', '120')
-    
+
     print(f"Starting DAO AI Builder on port {port}")
     if os.environ.get('DATABRICKS_HOST'):
         print(f"DATABRICKS_HOST: {os.environ.get('DATABRICKS_HOST')}")
-    
-    # Run gunicorn
+
+    # Run gunicorn with threaded workers: each SSE chat stream holds its
+    # connection open for the life of the LLM response, and each prompt
+    # generation blocks on a multi-second serving-endpoint call, so sync
+    # workers would cap concurrency at the worker count. With gthread,
+    # in-flight LLM requests scale with workers x THREADS instead.
     cmd = [
         'gunicorn',
         '--bind', f'0.0.0.0:{port}',
         '--workers', workers,
+        '--worker-class', 'gthread',
+        '--threads', threads,
         '--timeout', timeout,
         'app:app'
     ]
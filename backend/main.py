@@ -37,6 +37,26 @@ from flask import Flask, send_from_directory, jsonify, request, Response
 
 app = Flask(__name__, static_folder='static')
 
+# Use orjson for jsonify responses when available; it encodes straight to
+# bytes and is several times faster than the stdlib encoder. Falls back to
+# Flask's default provider when orjson is not installed.
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+
+    class _OrjsonProvider(DefaultJSONProvider):
+        """flask.json provider backed by orjson."""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=str).decode('utf-8')
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = _OrjsonProvider(app)
+except ImportError:
+    pass
+
 # Static folder path
 STATIC_FOLDER = os.environ.get('STATIC_FOLDER', 'static')
 if not os.path.isabs(STATIC_FOLDER):
@@ -272,4 +292,24 @@ if __name__ == '__main__':
         print(f"DATABRICKS_HOST: {os.environ.get('DATABRICKS_HOST')}")
     if os.environ.get('DATABRICKS_TOKEN'):
         print("DATABRICKS_TOKEN: [set]")
-    app.run(host='0.0.0.0', port=port, debug=debug)
+    if debug:
+        # Werkzeug dev server (reloader + debugger) for explicit dev runs only
+        app.run(host='0.0.0.0', port=port, debug=True)
+    else:
+        # Werkzeug's dev server is single-threaded; serve through gunicorn with
+        # threaded workers so concurrent proxy requests don't queue behind each
+        # other. --chdir pins module resolution to this file's directory so the
+        # launch works from any cwd (e.g. `python backend/main.py` at repo root).
+        import subprocess
+        workers = os.environ.get('WORKERS', '2')
+        threads = os.environ.get('THREADS', '8')
+        subprocess.run([
+            'gunicorn',
+            '--chdir', os.path.dirname(os.path.abspath(__file__)),
+            '--bind', f'0.0.0.0:{port}',
+            '--workers', workers,
+            '--worker-class', 'gthread',
+            '--threads', threads,
+            '--timeout', '120',
+            'main:app',
+        ], check=True)